@@ -5,27 +5,48 @@ AI Package for YMYL Audit Tool
 AI-powered analysis components for YMYL compliance checking.
 """
 
-# Import main classes for easier access
-try:
-    from .analysis_engine import AnalysisEngine
-    from .assistant_client import AssistantClient
-except ImportError as e:
-    # If imports fail, create dummy logger to prevent crashes
-    import logging
-    logger = logging.getLogger(__name__)
-    logger.error(f"Failed to import AI modules: {e}")
-    
-    # Create placeholder classes to prevent import errors
-    class AnalysisEngine:
-        def __init__(self, *args, **kwargs):
-            raise ImportError("AnalysisEngine could not be imported properly")
-    
-    class AssistantClient:
-        def __init__(self, *args, **kwargs):
-            raise ImportError("AssistantClient could not be imported properly")
+import importlib
+
+# Main classes for easier access - imported lazily (PEP 562) so the OpenAI SDK
+# is only loaded when one of them is actually used
+_LAZY_IMPORTS = {
+    'AnalysisEngine': '.analysis_engine',
+    'AssistantClient': '.assistant_client',
+}
+
+
+def _create_placeholder(name: str):
+    """Create placeholder class to prevent import errors."""
+    def __init__(self, *args, **kwargs):
+        raise ImportError(f"{name} could not be imported properly")
+    return type(name, (), {'__init__': __init__})
+
+
+def __getattr__(name: str):
+    """Import the requested class on first access and cache it on the package."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    try:
+        value = getattr(importlib.import_module(module_name, __name__), name)
+    except ImportError as e:
+        # If imports fail, log and hand out a placeholder to prevent crashes
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.error(f"Failed to import AI modules: {e}")
+        value = _create_placeholder(name)
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
+
 
 __version__ = "1.0.0"
 __all__ = [
     'AnalysisEngine',
     'AssistantClient'
-]
\ No newline at end of file
+]
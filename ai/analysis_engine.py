@@ -7,14 +7,23 @@ UPDATED: Single request architecture - sends full content in one API call
 import asyncio
 import time
 import json
-from datetime import datetime
 from typing import Dict, Any, Optional, Callable
 from ai.assistant_client import AssistantClient
+from ai.response_cache import ResponseCache, get_response_cache
 from utils.json_utils import parse_json_output, convert_ai_response_to_markdown
 from utils.logging_utils import setup_logger
 
+# Import settings with error handling
+try:
+    from config.settings import AI_ANALYSIS
+except ImportError:
+    AI_ANALYSIS = {}
+
 logger = setup_logger(__name__)
 
+# Seconds of assistant run time at which polling progress is halfway to the report step
+_RUN_PROGRESS_HALF_LIFE = 60.0
+
 
 class AnalysisEngine:
     """Single-request AI analysis engine."""
@@ -23,15 +32,31 @@ class AnalysisEngine:
         self.assistant_client = AssistantClient(api_key)
         self.progress_callback = progress_callback
         self.analysis_start_time = None
+        self.response_cache = get_response_cache()
+        self.cache_stats = {"hits": 0, "misses": 0}
+        self._last_progress = 0.0
+        self._last_progress_ts = 0.0
+        self._progress_interval = AI_ANALYSIS.get('PROGRESS_UPDATE_INTERVAL', 0.5)
 
-    async def process_json_content(self, json_output: str) -> Dict[str, Any]:
-        """Process JSON through AI analysis in single request."""
+    async def process_json_content(self, json_output: str,
+                                   json_data: Optional[Dict[str, Any]] = None,
+                                   use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Process JSON through AI analysis in single request.
+        
+        Args:
+            json_output (str): Raw JSON string sent to the assistant
+            json_data (dict): Already-parsed form of json_output, if the caller has it
+            use_cache (bool): Reuse a cached analysis of identical content (the result is cached either way)
+        """
         logger.info("Starting single-request analysis")
-        self.analysis_start_time = time.time()
+        self.analysis_start_time = time.perf_counter()
         
         try:
-            # Parse JSON
-            json_data = parse_json_output(json_output)
+            # Parse JSON (skipped when the caller already holds the parsed dict);
+            # large payloads are parsed in a worker thread to keep the event loop free
+            if json_data is None:
+                json_data = await asyncio.to_thread(parse_json_output, json_output)
             if not json_data:
                 return {"success": False, "error": "Invalid JSON"}
             
@@ -41,37 +66,59 @@ class AnalysisEngine:
                 return {"success": False, "error": "No chunks found"}
             
             # Update progress
-            if self.progress_callback:
-                self.progress_callback({
-                    'progress': 0.1,
-                    'message': f'Sending {len(big_chunks)} chunks for analysis...'
-                })
+            self._update_progress(f'Sending {len(big_chunks)} chunks for analysis...', 0.1)
             
-            # Single AI request with full content
-            ai_result = await self.assistant_client.analyze_full_content(json_output)
+            # Serve identical content from the response cache. With use_cache off the lookup
+            # is skipped but the fresh result is still stored, replacing any stale entry.
+            cache = self.response_cache
+            cache_key = None
+            ai_response_data = None
+            retries = 0
+            response_length = 0
+            if cache:
+                cache_key = ResponseCache.make_key(
+                    self.assistant_client.assistant_id,
+                    AI_ANALYSIS.get('PROMPT_VERSION', '1'),
+                    json_output
+                )
+                if use_cache:
+                    ai_response_data = await cache.get(cache_key)
             
-            if not ai_result.get('success'):
-                return {"success": False, "error": ai_result.get('error', 'AI analysis failed')}
+            if ai_response_data is not None:
+                self.cache_stats["hits"] += 1
+                logger.info("Response cache hit - skipping AI request")
+            else:
+                if cache and use_cache:
+                    self.cache_stats["misses"] += 1
+                
+                # Single AI request with full content
+                ai_result = await self.assistant_client.analyze_full_content(
+                    json_output, status_callback=self._report_run_status
+                )
+                
+                if not ai_result.get('success'):
+                    return {"success": False, "error": ai_result.get('error', 'AI analysis failed')}
+                
+                ai_response_data = ai_result['content']
+                retries = ai_result.get('attempts', 1) - 1
+                response_length = ai_result.get('response_length', 0)
+                if cache:
+                    # The analysis already succeeded; a cache write failure must not fail it
+                    try:
+                        await cache.set(cache_key, ai_response_data)
+                    except Exception as e:
+                        logger.warning(f"Could not cache AI response: {e}")
             
             # Update progress
-            if self.progress_callback:
-                self.progress_callback({
-                    'progress': 0.8,
-                    'message': 'Converting AI response to report...'
-                })
+            self._update_progress('Converting AI response to report...', 0.8)
             
-            # Convert AI response to markdown report
-            ai_response_data = ai_result['content']
-            report = convert_ai_response_to_markdown(ai_response_data)
+            # Convert AI response to markdown report (CPU-bound, so off the event loop)
+            report = await asyncio.to_thread(convert_ai_response_to_markdown, ai_response_data)
             
             # Update progress
-            if self.progress_callback:
-                self.progress_callback({
-                    'progress': 1.0,
-                    'message': 'Analysis complete!'
-                })
+            self._update_progress('Analysis complete!', 1.0)
             
-            processing_time = time.time() - self.analysis_start_time
+            processing_time = time.perf_counter() - self.analysis_start_time
             
             return {
                 "success": True,
@@ -83,7 +130,10 @@ class AnalysisEngine:
                     "total_processing_time": processing_time,
                     "successful_analyses": 1,
                     "failed_analyses": 0,
-                    "success_rate": 100.0
+                    "success_rate": 100.0,
+                    "retries": retries,
+                    "response_length": response_length,
+                    "cache_stats": dict(self.cache_stats)
                 }
             }
             
@@ -92,6 +142,38 @@ class AnalysisEngine:
             logger.error(error_msg)
             return {"success": False, "error": error_msg}
 
+    def _update_progress(self, message: str, progress: float):
+        """
+        Send a progress update to the callback; no payload is built when none is set.
+        Intermediate updates that advance less than 1% within PROGRESS_UPDATE_INTERVAL
+        of the last one are dropped; the first (0.0) and final (1.0) updates are always sent.
+        """
+        callback = self.progress_callback
+        if callback is None:
+            return
+        now = time.monotonic()
+        if (progress not in (0.0, 1.0)
+                and progress - self._last_progress < 0.01
+                and now - self._last_progress_ts < self._progress_interval):
+            return
+        self._last_progress = progress
+        self._last_progress_ts = now
+        try:
+            callback({'progress': progress, 'message': message})
+        except Exception as e:
+            logger.warning(f"Progress callback error: {e}")
+
+    def _report_run_status(self, status: str, elapsed: float):
+        """
+        Turn assistant run polling into progress between the request (0.1) and the report (0.8).
+        The run length is unknown, so progress approaches 0.75 without reaching it.
+        elapsed restarts with each retry attempt, so progress never moves backwards.
+        """
+        progress = 0.1 + 0.65 * elapsed / (elapsed + _RUN_PROGRESS_HALF_LIFE)
+        progress = max(progress, self._last_progress)
+        status_text = 'queued' if status == 'queued' else 'in progress'
+        self._update_progress(f'AI analysis {status_text} ({elapsed:.0f}s elapsed)...', progress)
+
     async def cleanup(self):
         """Clean up resources."""
         if self.assistant_client:
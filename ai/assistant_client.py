@@ -7,100 +7,181 @@ UPDATED: Single request architecture - analyzes full content in one call
 import asyncio
 import time
 import json
-from typing import Dict, Any, Optional
+import random
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable
 from openai import OpenAI
-from config.settings import ANALYZER_ASSISTANT_ID, SINGLE_REQUEST_TIMEOUT
+from config.settings import ANALYZER_ASSISTANT_ID, SINGLE_REQUEST_TIMEOUT, AI_ANALYSIS
 from utils.logging_utils import setup_logger
+from utils.json_utils import fast_json_loads
 
 logger = setup_logger(__name__)
 
+# Markdown code fence the model sometimes wraps around its JSON array
+_CODE_FENCE_RE = re.compile(r'^```(?:json)?\s*(.*?)\s*```$', re.DOTALL)
+
+# HTTP statuses worth another attempt: request timeout, rate limit and server-side errors
+_RETRIABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+# Longest wait between attempts, in seconds
+_MAX_RETRY_WAIT = 60
+
+# run.last_error.code values worth another attempt; other codes (e.g. invalid_prompt) recur
+_RETRIABLE_RUN_ERROR_CODES = frozenset({'rate_limit_exceeded', 'server_error'})
+
+# Exceptions without an HTTP status worth another attempt: connection problems and timeouts
+_RETRIABLE_ERROR_RE = re.compile(
+    r'429|rate.?limit|\b5\d\d\b|server.?error|overloaded|timeout|timed out|connection',
+    re.IGNORECASE
+)
+
+
+def _is_retriable_failure(result: Dict[str, Any]) -> bool:
+    """
+    Check whether a failed attempt is likely to succeed when retried.
+    
+    Failures classified where they happen carry an explicit "retriable" flag (run
+    errors by their last_error code). For exceptions, an HTTP status from the API
+    decides on its own (other 4xx errors such as bad credentials or an invalid
+    request fail the same way every time); only exceptions without one fall back
+    to matching the error message.
+    """
+    if 'retriable' in result:
+        return result['retriable']
+    status_code = result.get('status_code')
+    if status_code is not None:
+        return status_code in _RETRIABLE_STATUS_CODES
+    error = result.get('error')
+    return bool(error) and _RETRIABLE_ERROR_RE.search(error) is not None
+
+
+# One SDK client per API key, so its HTTP connection pool (and the TLS sessions in it)
+# is reused across analyses instead of being rebuilt for every AnalysisEngine.
+# Kept as a small LRU so keys typed into the sidebar don't accumulate for the process lifetime.
+_MAX_CLIENTS = 4
+_clients: "OrderedDict[str, OpenAI]" = OrderedDict()
+_clients_lock = threading.Lock()
+
+
+def _get_openai_client(api_key: str) -> OpenAI:
+    """Get the shared OpenAI client for an API key, creating it on first use."""
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            client = _clients[api_key] = OpenAI(
+                api_key=api_key,
+                timeout=AI_ANALYSIS.get('HTTP_TIMEOUT', 60.0)
+            )
+            # Evicted clients aren't closed - a running analysis may still hold one
+            while len(_clients) > _MAX_CLIENTS:
+                _clients.popitem(last=False)
+        else:
+            _clients.move_to_end(api_key)
+        return client
+
+
+def _discard_openai_client(client: OpenAI):
+    """Forget a shared client, e.g. after its API key was rejected."""
+    with _clients_lock:
+        for api_key, cached_client in list(_clients.items()):
+            if cached_client is client:
+                del _clients[api_key]
+
 
 class AssistantClient:
     """Client for single-request AI analysis using OpenAI Assistant API."""
     
     def __init__(self, api_key: str, assistant_id: str = ANALYZER_ASSISTANT_ID):
-        self.client = OpenAI(api_key=api_key)
+        self.client = _get_openai_client(api_key)
         self.assistant_id = assistant_id
         logger.info(f"AssistantClient initialized for single-request analysis")
 
-    async def analyze_full_content(self, json_content: str, max_retries: int = 3) -> Dict[str, Any]:
+    async def analyze_full_content(self, json_content: str, max_retries: Optional[int] = None,
+                                   status_callback: Optional[Callable[[str, float], None]] = None) -> Dict[str, Any]:
         """
         Analyze full content in single request.
         
+        Transient failures are retried with jittered exponential backoff;
+        permanent ones (e.g. authentication errors) fail immediately.
+        
         Args:
             json_content (str): Complete chunked JSON content
-            max_retries (int): Maximum retry attempts
+            max_retries (int): Maximum retry attempts (defaults to AI_ANALYSIS['MAX_RETRIES'])
+            status_callback (callable): Called with (run status, elapsed seconds) after each poll
             
         Returns:
-            dict: Analysis result with success status and AI response
+            dict: Analysis result with success status, AI response and attempt count
         """
+        if max_retries is None:
+            max_retries = AI_ANALYSIS.get('MAX_RETRIES', 3)
+        backoff = AI_ANALYSIS.get('RETRY_BACKOFF_MULTIPLIER', 2)
+        
         logger.info(f"Starting full content analysis ({len(json_content):,} characters)")
         
+        last_error = None
         for attempt in range(max_retries + 1):
             try:
-                result = await self._single_analysis_attempt(json_content)
-                
-                if result["success"]:
-                    logger.info(f"Analysis successful on attempt {attempt + 1}")
-                    return result
-                else:
-                    logger.warning(f"Analysis failed on attempt {attempt + 1}: {result.get('error')}")
-                    
+                result = await self._single_analysis_attempt(json_content, status_callback)
             except Exception as e:
                 logger.error(f"Exception during analysis attempt {attempt + 1}: {str(e)}")
-                
-                if attempt == max_retries:
-                    return {
-                        "success": False,
-                        "error": f"Failed after {max_retries + 1} attempts. Last error: {str(e)}",
-                        "attempts": attempt + 1
-                    }
-                
+                result = {"success": False, "error": str(e), "status_code": getattr(e, 'status_code', None)}
+            
+            if result["success"]:
+                logger.info(f"Analysis successful on attempt {attempt + 1}")
+                result["attempts"] = attempt + 1
+                return result
+            
+            last_error = result.get('error')
+            logger.warning(f"Analysis failed on attempt {attempt + 1}: {last_error}")
+            
+            if result.get('status_code') == 401:
+                # Rejected key (typo, revoked) - don't keep its client around
+                _discard_openai_client(self.client)
+            
+            if not _is_retriable_failure(result):
+                logger.info("Error is not transient, giving up without retrying")
+                break
+            
+            if attempt < max_retries:
                 # Wait before retry
-                wait_time = 2 ** attempt
-                logger.info(f"Waiting {wait_time} seconds before retry...")
+                wait_time = min(_MAX_RETRY_WAIT, backoff ** attempt) + random.random()
+                logger.info(f"Waiting {wait_time:.1f} seconds before retry...")
                 await asyncio.sleep(wait_time)
         
         return {
             "success": False,
-            "error": f"Failed after {max_retries + 1} attempts",
-            "attempts": max_retries + 1
+            "error": f"Failed after {attempt + 1} attempts. Last error: {last_error}",
+            "attempts": attempt + 1
         }
 
-    async def _single_analysis_attempt(self, json_content: str) -> Dict[str, Any]:
+    async def _single_analysis_attempt(self, json_content: str,
+                                       status_callback: Optional[Callable[[str, float], None]] = None) -> Dict[str, Any]:
         """Perform single analysis attempt with full content."""
         try:
-            # Create thread
-            thread = self.client.beta.threads.create()
-            thread_id = thread.id
-            logger.debug(f"Created thread {thread_id}")
-            
-            # Add message with full content
-            self.client.beta.threads.messages.create(
-                thread_id=thread_id,
-                role="user",
-                content=json_content
-            )
-            logger.debug(f"Added full content to thread {thread_id}")
-            
-            # Create and run assistant
-            run = self.client.beta.threads.runs.create(
-                thread_id=thread_id,
-                assistant_id=self.assistant_id
+            # Create thread with the full content and start the run in one round trip
+            run = self.client.beta.threads.create_and_run(
+                assistant_id=self.assistant_id,
+                thread={
+                    "messages": [{"role": "user", "content": json_content}]
+                }
             )
+            thread_id = run.thread_id
             run_id = run.id
-            logger.debug(f"Started run {run_id}")
+            logger.debug("Started run %s on thread %s", run_id, thread_id)
             
             # Poll for completion with extended timeout
-            start_time = time.time()
+            start_time = time.perf_counter()
             max_wait_time = getattr(self, 'timeout', SINGLE_REQUEST_TIMEOUT)
             
             while run.status in ['queued', 'in_progress']:
-                if time.time() - start_time > max_wait_time:
+                if time.perf_counter() - start_time > max_wait_time:
                     logger.error(f"Analysis timeout after {max_wait_time} seconds")
                     return {
                         "success": False,
-                        "error": f"Analysis timeout after {max_wait_time} seconds"
+                        "error": f"Analysis timeout after {max_wait_time} seconds",
+                        "retriable": True
                     }
                 
                 await asyncio.sleep(2)  # Longer polling interval for large requests
@@ -108,20 +189,28 @@ class AssistantClient:
                     thread_id=thread_id,
                     run_id=run_id
                 )
+                
+                # Report that the run is still alive, so long analyses don't look frozen
+                if status_callback:
+                    status_callback(run.status, time.perf_counter() - start_time)
             
-            processing_time = time.time() - start_time
-            logger.debug(f"Analysis completed in {processing_time:.2f} seconds with status: {run.status}")
+            processing_time = time.perf_counter() - start_time
+            logger.debug("Analysis completed in %.2f seconds with status: %s", processing_time, run.status)
             
             # Handle completion status
             if run.status == 'completed':
                 return await self._extract_response(thread_id, processing_time)
             
             elif run.status == 'failed':
-                error_msg = f"Assistant run failed: {getattr(run, 'last_error', 'Unknown error')}"
+                last_error = getattr(run, 'last_error', None)
+                error_code = getattr(last_error, 'code', None)
+                error_msg = f"Assistant run failed: {last_error or 'Unknown error'}"
                 logger.error(error_msg)
                 return {
                     "success": False,
-                    "error": error_msg
+                    "error": error_msg,
+                    "error_code": error_code,
+                    "retriable": error_code in _RETRIABLE_RUN_ERROR_CODES
                 }
             
             else:
@@ -129,14 +218,16 @@ class AssistantClient:
                 logger.error(error_msg)
                 return {
                     "success": False,
-                    "error": error_msg
+                    "error": error_msg,
+                    "retriable": False
                 }
                 
         except Exception as e:
             logger.error(f"Exception in analysis attempt: {str(e)}")
             return {
                 "success": False,
-                "error": str(e)
+                "error": str(e),
+                "status_code": getattr(e, 'status_code', None)  # Set by openai.APIStatusError
             }
 
     async def _extract_response(self, thread_id: str, processing_time: float) -> Dict[str, Any]:
@@ -148,7 +239,8 @@ class AssistantClient:
             if not messages.data:
                 return {
                     "success": False,
-                    "error": "No messages found in thread"
+                    "error": "No messages found in thread",
+                    "retriable": False
                 }
             
             # Get assistant's response
@@ -157,39 +249,44 @@ class AssistantClient:
             if not assistant_message.content:
                 return {
                     "success": False,
-                    "error": "Empty response from assistant"
+                    "error": "Empty response from assistant",
+                    "retriable": True  # A fresh run usually fixes malformed/empty answers
                 }
             
             # Extract text content
             response_content = assistant_message.content[0].text.value
             
-            if not response_content or not response_content.strip():
+            if not response_content or response_content.isspace():
                 return {
                     "success": False,
-                    "error": "Assistant returned empty content"
+                    "error": "Assistant returned empty content",
+                    "retriable": True
                 }
             
             # Validate JSON response format
             try:
-                ai_data = json.loads(response_content)
+                ai_data = self._parse_json_response(response_content)
                 if not isinstance(ai_data, list):
                     return {
                         "success": False,
-                        "error": "AI response is not a JSON array as expected"
+                        "error": "AI response is not a JSON array as expected",
+                        "retriable": True
                     }
             except json.JSONDecodeError as e:
                 return {
                     "success": False,
-                    "error": f"AI response is not valid JSON: {str(e)}"
+                    "error": f"AI response is not valid JSON: {str(e)}",
+                    "retriable": True
                 }
             
-            logger.info(f"Successfully extracted AI response ({len(response_content):,} characters)")
+            response_length = len(response_content)
+            logger.info(f"Successfully extracted AI response ({response_length:,} characters)")
             
             return {
                 "success": True,
                 "content": ai_data,
                 "processing_time": processing_time,
-                "response_length": len(response_content),
+                "response_length": response_length,
                 "thread_id": thread_id
             }
             
@@ -197,9 +294,26 @@ class AssistantClient:
             logger.error(f"Error extracting response: {str(e)}")
             return {
                 "success": False,
-                "error": f"Error extracting response: {str(e)}"
+                "error": f"Error extracting response: {str(e)}",
+                "status_code": getattr(e, 'status_code', None)
             }
 
+    def _parse_json_response(self, response_content: str) -> Any:
+        """
+        Decode the assistant's structured JSON output.
+        
+        The response is parsed directly; only if that fails is a surrounding
+        markdown code fence stripped, so a fenced answer doesn't cost a full re-run.
+        """
+        try:
+            return fast_json_loads(response_content)
+        except json.JSONDecodeError:
+            fenced = _CODE_FENCE_RE.match(response_content.strip())
+            if not fenced:
+                raise
+            logger.info("AI response was wrapped in a code fence, parsing inner JSON")
+            return fast_json_loads(fenced.group(1))
+
     def validate_api_key(self) -> bool:
         """Validate API key."""
         try:
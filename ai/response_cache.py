@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Response Cache for YMYL Audit Tool
+
+Stores successful assistant analyses keyed by a blake2b hash of the assistant id,
+prompt version and submitted content, so re-analyzing identical content is
+served locally instead of making another API round trip.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+from utils.logging_utils import setup_logger
+
+# Import settings with error handling
+try:
+    from config.settings import AI_ANALYSIS
+except ImportError:
+    AI_ANALYSIS = {}
+
+logger = setup_logger(__name__)
+
+
+class MemoryBackend:
+    """In-process LRU store with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        # Streamlit serves each session from its own thread
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class FileBackend(MemoryBackend):
+    """LRU store persisted to a JSON file so entries survive app restarts."""
+
+    def __init__(self, path: str, max_entries: int = 64):
+        super().__init__(max_entries)
+        self.path = path
+        # Serializes whole save operations (snapshot, write, replace) across session threads
+        self._save_lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable response cache {self.path}: {e}")
+            return
+
+        if not isinstance(stored, list):
+            logger.warning(f"Ignoring response cache {self.path}: unexpected format")
+            return
+
+        now = time.time()
+        skipped = 0
+        for entry in stored:
+            # Each entry is [key, expires_at, value]; skip anything else rather than fail startup
+            if (not isinstance(entry, list) or len(entry) != 3 or not isinstance(entry[0], str)
+                    or not (entry[1] is None or isinstance(entry[1], (int, float)))):
+                skipped += 1
+                continue
+            key, expires_at, value = entry
+            if expires_at is None or expires_at >= now:
+                self._entries[key] = (expires_at, value)
+        if skipped:
+            logger.warning(f"Skipped {skipped} malformed entries in response cache {self.path}")
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _save(self) -> bool:
+        """
+        Persist all entries; returns False if an entry could not be serialized.
+        Writes to a unique temporary file first so a crash never leaves a truncated cache,
+        and holds the save lock throughout so concurrent saves can't interleave.
+        """
+        with self._save_lock:
+            with self._lock:
+                stored = [[key, expires_at, value] for key, (expires_at, value) in self._entries.items()]
+            tmp_path = None
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(
+                    dir=directory or '.', prefix=f"{os.path.basename(self.path)}.", suffix='.tmp'
+                )
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(stored, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+                return True
+            except (OSError, TypeError, ValueError) as e:
+                # ValueError covers UnicodeEncodeError from lone surrogates in a response
+                logger.warning(f"Could not persist response cache to {self.path}: {e}")
+                if tmp_path:
+                    try:
+                        os.remove(tmp_path)
+                    except OSError:
+                        pass
+                return isinstance(e, OSError)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        super().set(key, value, ttl)
+        if not self._save():
+            # Drop the value that can't be written so it doesn't block every later save
+            with self._lock:
+                self._entries.pop(key, None)
+            self._save()
+
+    def clear(self):
+        super().clear()
+        self._save()
+
+
+class ResponseCache:
+    """Async get/set facade over a cache backend."""
+
+    def __init__(self, backend: MemoryBackend, ttl: Optional[float] = None):
+        self.backend = backend
+        self.ttl = ttl
+
+    @staticmethod
+    def make_key(assistant_id: str, prompt_version: str, content: str) -> str:
+        """
+        Build the cache key for one assistant request.
+        blake2b is faster than sha256 and a 128-bit digest is ample for a non-cryptographic key.
+        """
+        key_source = f"{assistant_id}\0{prompt_version}\0{content}".encode('utf-8')
+        return hashlib.blake2b(key_source, digest_size=16).hexdigest()
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self.backend.get(key)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        ttl = ttl if ttl is not None else self.ttl
+        if isinstance(self.backend, FileBackend):
+            # The file backend rewrites the whole cache file; keep that off the event loop
+            await asyncio.to_thread(self.backend.set, key, value, ttl)
+        else:
+            self.backend.set(key, value, ttl)
+
+    def clear(self):
+        self.backend.clear()
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Get the process-wide response cache configured in AI_ANALYSIS.
+
+    Shared at module level because a new AnalysisEngine is created per analysis.
+
+    Returns:
+        ResponseCache or None if caching is disabled
+    """
+    global _default_cache
+
+    cache_config = AI_ANALYSIS.get('RESPONSE_CACHE', {})
+    if not cache_config.get('ENABLED', False):
+        return None
+
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                max_entries = cache_config.get('MAX_ENTRIES', 64)
+                if cache_config.get('BACKEND') == 'file':
+                    backend = FileBackend(cache_config.get('FILE_PATH', 'data/llm_cache.json'), max_entries)
+                else:
+                    backend = MemoryBackend(max_entries)
+                _default_cache = ResponseCache(backend, cache_config.get('TTL_SECONDS'))
+                logger.info(f"Response cache initialized ({type(backend).__name__}, max {max_entries} entries)")
+
+    return _default_cache
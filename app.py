@@ -14,7 +14,8 @@ from collections import defaultdict
 from extractors.content_extractor import ContentExtractor
 from processors.chunk_processor import ChunkProcessor
 from ai.analysis_engine import AnalysisEngine
-from utils.json_utils import parse_json_output, decode_unicode_escapes
+from utils.json_utils import parse_json_output, decode_unicode_escapes, fast_json_loads, fast_json_dumps
+from config.settings import MAX_CONTENT_LENGTH, MAX_CONTENT_SIZE_FOR_AI
 from ui.components import (
     create_page_header,
     create_sidebar_config,
@@ -42,6 +43,14 @@ st.set_page_config(
 # Setup logging
 logger = setup_logger(__name__)
 
+# Run the analysis event loop on uvloop when it is installed (optional, not on Windows)
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("Using uvloop event loop policy")
+except ImportError:
+    pass
+
 # =============================================================================
 # AUTHENTICATION SYSTEM
 # =============================================================================
@@ -366,8 +375,7 @@ def process_direct_json_workflow(json_content: str, debug_mode: bool = False) ->
         
         # Try to parse JSON to check basic validity
         try:
-            import json
-            parsed_json = json.loads(decoded_json_content)
+            parsed_json = fast_json_loads(decoded_json_content)
             
             # Basic structure check
             if not isinstance(parsed_json, dict):
@@ -480,7 +488,6 @@ def process_raw_content_workflow(raw_content: str, debug_mode: bool = False) ->
             return result
         
         # Check content length
-        from config.settings import MAX_CONTENT_LENGTH
         if len(raw_content) > MAX_CONTENT_LENGTH:
             error_msg = f"Content too large: {len(raw_content):,} characters (max: {MAX_CONTENT_LENGTH:,})"
             result['error'] = error_msg
@@ -563,17 +570,19 @@ def validate_analysis_freshness(result: dict, ai_result: dict = None) -> bool:
     
     return True
 
-async def process_ai_analysis(json_output: str, api_key: str, source_result: dict = None) -> dict:
+async def process_ai_analysis(json_output: str, api_key: str, source_result: dict = None,
+                              use_cache: bool = True) -> dict:
     """
     Process AI compliance analysis.
     UPDATED: Single request architecture with import fix
+    NEW: use_cache=False forces a fresh AI request for unchanged content
     """
     try:
         logger.info("Starting single-request AI analysis workflow")
         
         # Handle both string and dict inputs
         if isinstance(json_output, str):
-            json_data = parse_json_output(json_output)
+            json_data = await asyncio.to_thread(parse_json_output, json_output)
         elif isinstance(json_output, dict):
             json_data = json_output
         else:
@@ -582,14 +591,13 @@ async def process_ai_analysis(json_output: str, api_key: str, source_result: dic
         if not json_data:
             return {'success': False, 'error': 'Failed to parse JSON content'}
         
-        # Validate content size - FIXED: Use fallback if import fails
-        json_string = json.dumps(json_data) if isinstance(json_data, dict) else json_output
-        content_size = len(json_string)
+        # Use raw JSON string for processing - only re-serialize when no raw string exists
+        json_string_for_ai = source_result.get('json_output_raw') if source_result else None
+        if not json_string_for_ai:
+            json_string_for_ai = json_output if isinstance(json_output, str) else fast_json_dumps(json_data)
         
-        try:
-            from config.settings import MAX_CONTENT_SIZE_FOR_AI
-        except ImportError:
-            MAX_CONTENT_SIZE_FOR_AI = 2000000  # 2MB fallback
+        # Validate content size of the payload actually sent
+        content_size = len(json_string_for_ai)
         
         if content_size > MAX_CONTENT_SIZE_FOR_AI:
             return {
@@ -631,12 +639,11 @@ async def process_ai_analysis(json_output: str, api_key: str, source_result: dic
             # Initialize analysis engine
             analysis_engine = AnalysisEngine(api_key, progress_callback=update_ui_progress)
             
-            # Use raw JSON string for processing
-            json_string_for_ai = source_result.get('json_output_raw') if source_result else json_string
-            
-            # Process with single request
+            # Process with single request (pass the parsed dict so it isn't parsed twice)
             logger.info("Starting single AI analysis request...")
-            results = await analysis_engine.process_json_content(json_string_for_ai)
+            results = await analysis_engine.process_json_content(
+                json_string_for_ai, json_data=json_data, use_cache=use_cache
+            )
             
             # Update final progress
             progress_bar.progress(1.0)
@@ -687,6 +694,7 @@ def main():
     config = create_sidebar_config()
     debug_mode = config['debug_mode']
     api_key = config['api_key']
+    use_cache = config.get('use_cache', True)
     
     # Store debug mode in session state
     st.session_state['debug_mode'] = debug_mode
@@ -749,7 +757,8 @@ def main():
                         ai_results = asyncio.run(process_ai_analysis(
                             json_for_ai, 
                             api_key, 
-                            source_result=result
+                            source_result=result,
+                            use_cache=use_cache
                         ))
                     
                     # Store results
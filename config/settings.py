@@ -36,6 +36,7 @@ SUPPORTED_EXPORT_FORMATS = ['docx']
 MAX_CONTENT_LENGTH = 1000000  # 1MB limit for content processing
 CHUNK_POLLING_INTERVAL = 0.2
 CHUNK_POLLING_TIMEOUT = 30
+DIRECT_INPUT_BATCH_SIZE = 10000  # Characters per send_keys call when paste fails
 
 # UI Configuration (unchanged)
 DEFAULT_TIMEZONE = "Europe/Malta"
@@ -78,7 +79,16 @@ AI_ANALYSIS = {
     'RETRY_BACKOFF_MULTIPLIER': 2,
     'ENABLE_PROGRESS_TRACKING': True,
     'PROGRESS_UPDATE_INTERVAL': 0.5,
-    'MAX_CONTENT_SIZE': MAX_CONTENT_SIZE_FOR_AI
+    'MAX_CONTENT_SIZE': MAX_CONTENT_SIZE_FOR_AI,
+    'HTTP_TIMEOUT': 60.0,   # NEW: Per-call OpenAI HTTP timeout (seconds); runs are polled, so calls are short
+    'PROMPT_VERSION': '1',  # NEW: Bump when the assistant instructions change to invalidate cached responses
+    'RESPONSE_CACHE': {     # NEW: Reuse analyses of identical content
+        'ENABLED': True,
+        'BACKEND': 'memory',  # 'memory' or 'file'
+        'FILE_PATH': 'data/llm_cache.json',
+        'TTL_SECONDS': 24 * 3600,
+        'MAX_ENTRIES': 64
+    }
 }
 
 # UI Enhancement Settings (simplified)
@@ -250,7 +260,7 @@ __all__ = [
     'ANALYZER_ASSISTANT_ID', 'SINGLE_REQUEST_TIMEOUT', 'MAX_CONTENT_SIZE_FOR_AI',
     'SELENIUM_TIMEOUT', 'CHUNK_API_URL', 'CHROME_OPTIONS',
     'REQUEST_TIMEOUT', 'USER_AGENT', 'DEFAULT_EXPORT_FORMAT', 'SUPPORTED_EXPORT_FORMATS',
-    'MAX_CONTENT_LENGTH', 'CHUNK_POLLING_INTERVAL', 'CHUNK_POLLING_TIMEOUT',
+    'MAX_CONTENT_LENGTH', 'CHUNK_POLLING_INTERVAL', 'CHUNK_POLLING_TIMEOUT', 'DIRECT_INPUT_BATCH_SIZE',
     'DEFAULT_TIMEZONE', 'DEBUG_MODE_DEFAULT', 'LOG_FORMAT', 'LOG_LEVEL',
     'SESSION_MANAGEMENT', 'CONTENT_VALIDATION', 'AI_ANALYSIS', 'UI_SETTINGS',
     'ERROR_HANDLING', 'PERFORMANCE', 'FEATURE_FLAGS', 'SECURITY', 'EXPORT_CONFIG',
@@ -18,23 +18,48 @@ from utils.logging_utils import setup_logger
 
 logger = setup_logger(__name__)
 
+# Block-level markdown scanner: one compiled pattern classifies a stripped line
+# (heading / bold line / bullet / rule) instead of a chain of startswith() checks
+_MARKDOWN_LINE_RE = re.compile(
+    r'(?P<hashes>#{1,4}) (?P<heading>.*)'
+    r'|(?P<bold>\*\*.+\*\*)$'
+    r'|[-*] (?P<bullet>.*)'
+    r'|(?P<rule>---)'
+)
+
+# Heading depth -> Word built-in style (Google Docs maps these cleanly)
+_HEADING_STYLES = {1: 'Title', 2: 'Heading 1', 3: 'Heading 2', 4: 'Heading 3'}
+
+# Any severity/status indicator, found in one scan instead of one substring pass per emoji
+_SEVERITY_INDICATOR_RE = re.compile('[🔴🟠🟡🔵✅❌]')
+
+# Inline **bold** runs, split out with the delimiters kept
+_BOLD_SPLIT_RE = re.compile(r'(\*\*.*?\*\*)')
+
+# Emoji -> text replacements for better Word/Google Docs compatibility
+_SEVERITY_EMOJI_REPLACEMENTS = {
+    '🔴': '[CRITICAL]',
+    '🟠': '[HIGH]',      # NEW: Added high severity
+    '🟡': '[MEDIUM]',
+    '🔵': '[LOW]',
+    '✅': '[✓]',
+    '❌': '[✗]',
+    '⚠️': '[!]'
+}
+
+# Any replaceable emoji, so a line is scanned once instead of once per emoji
+_SEVERITY_EMOJI_REPLACEMENTS_RE = re.compile('|'.join(map(re.escape, _SEVERITY_EMOJI_REPLACEMENTS)))
+
+# Severity emoji -> run color, one dict lookup instead of an if/elif chain
+_SEVERITY_COLORS = {
+    '🔴': RGBColor(231, 76, 60),    # Red
+    '🟠': RGBColor(255, 152, 0),    # Orange - NEW
+    '🟡': RGBColor(243, 156, 18),   # Yellow/Gold
+    '🔵': RGBColor(52, 152, 219),   # Blue
+}
+
 
 class WordExporter:
-    
-    def _add_formatted_text_to_paragraph(self, paragraph, text):
-        """Add text with embedded bold formatting to a paragraph."""
-        import re
-        # Split text by bold markers
-        parts = re.split(r'(\*\*.*?\*\*)', text)
-        
-        for part in parts:
-            if part.startswith('**') and part.endswith('**') and len(part) > 4:
-                # Bold text
-                run = paragraph.add_run(part[2:-2])
-                run.bold = True
-            elif part:
-                # Regular text
-                paragraph.add_run(part)
     """
     Converts markdown reports to professionally formatted Word documents.
     
@@ -148,95 +173,91 @@ class WordExporter:
         lines = markdown_content.split('\n')
         in_processing_summary = False
         skip_next_empty = False
+        previous_blank = True  # Tracked instead of re-stripping the previous line
         
-        for i, line in enumerate(lines):
-            original_line = line
+        # Resolve styles and hot methods once; assigning a style by name makes
+        # python-docx search the styles part again for every paragraph
+        styles = doc.styles
+        heading_styles = {level: styles[name] for level, name in _HEADING_STYLES.items()}
+        bullet_style = styles['List Bullet']
+        summary_style = styles['Processing Summary']
+        normal_style = styles['Normal']
+        add_paragraph = doc.add_paragraph
+        
+        for line in lines:
             line = line.strip()
             
             # Skip empty lines after headers to prevent extra spacing
             if not line:
                 if skip_next_empty:
                     skip_next_empty = False
-                    continue
-                # Add paragraph break for intentional empty lines only if previous wasn't empty
-                if i > 0 and lines[i-1].strip():
-                    doc.add_paragraph()
+                elif not previous_blank:
+                    # Add paragraph break for intentional empty lines only if previous wasn't empty
+                    add_paragraph()
+                previous_blank = True
                 continue
+            previous_blank = False
             
             # Track processing summary section
             if line.startswith('## Processing Summary'):
                 in_processing_summary = True
-                paragraph = doc.add_paragraph(line[3:])
-                paragraph.style = 'Heading 1'  # Use built-in heading style
+                paragraph = add_paragraph(line[3:])
+                paragraph.style = heading_styles[2]  # Use built-in heading style
                 skip_next_empty = True
                 continue
             elif line.startswith('##') and in_processing_summary:
                 in_processing_summary = False
             
+            # Classify the line with a single regex match, then dispatch on the group
+            match = _MARKDOWN_LINE_RE.match(line)
+            kind = match.lastgroup if match else None
+            
             # Handle different markdown elements with better Google Docs compatibility
-            if line.startswith('# '):
-                # Main title - use built-in Title style
-                paragraph = doc.add_paragraph(line[2:])
-                paragraph.style = 'Title'  # Use Word's built-in Title style
+            if kind == 'heading':
+                # Title / section / subsection headings - use Word's built-in styles
+                paragraph = add_paragraph(match.group('heading'))
+                paragraph.style = heading_styles[len(match.group('hashes'))]
                 skip_next_empty = True
                 
-            elif line.startswith('## '):
-                # Section heading - use built-in Heading 1
-                paragraph = doc.add_paragraph(line[3:])
-                paragraph.style = 'Heading 1'  # Use Word's built-in heading
-                skip_next_empty = True
-                
-            elif line.startswith('### '):
-                # Subsection heading - use built-in Heading 2
-                paragraph = doc.add_paragraph(line[4:])
-                paragraph.style = 'Heading 2'  # Use Word's built-in heading
-                skip_next_empty = True
-                
-            elif line.startswith('#### '):
-                # Sub-subsection heading - use built-in Heading 3
-                paragraph = doc.add_paragraph(line[5:])
-                paragraph.style = 'Heading 3'
-                skip_next_empty = True
-                
-            elif line.startswith('**') and line.endswith('**') and len(line) > 4:
+            elif kind == 'bold':
                 # Bold text - handle as separate paragraph
-                p = doc.add_paragraph()
+                p = add_paragraph()
                 run = p.add_run(line[2:-2])
                 run.bold = True
                 
-            elif line.startswith('- ') or line.startswith('* '):
+            elif kind == 'bullet':
                 # Bullet points - use built-in List Bullet style
-                bullet_text = line[2:]
+                bullet_text = match.group('bullet')
                 
                 # ENHANCED: Special handling for explanation lines
                 if '**Explanation:**' in bullet_text:
                     # Create explanation with special formatting
-                    p = doc.add_paragraph(style='List Bullet')
+                    p = add_paragraph(style=bullet_style)
                     self._add_explanation_formatted_text(p, bullet_text)
                 elif '**' in bullet_text:
                     # Handle other bolded parts within bullet points
-                    p = doc.add_paragraph(style='List Bullet')
+                    p = add_paragraph(style=bullet_style)
                     self._add_formatted_text_to_paragraph(p, bullet_text)
                 else:
-                    doc.add_paragraph(bullet_text, style='List Bullet')
+                    add_paragraph(bullet_text, style=bullet_style)
                     
-            elif line.startswith('---'):
+            elif kind == 'rule':
                 # Horizontal rule - add more space and a subtle separator
-                doc.add_paragraph()
-                p = doc.add_paragraph('_' * 50)  # Underscore line
+                add_paragraph()
+                p = add_paragraph('_' * 50)  # Underscore line
                 p.alignment = WD_ALIGN_PARAGRAPH.CENTER
                 run = p.runs[0]
                 run.font.color.rgb = RGBColor(192, 192, 192)  # Light gray
-                doc.add_paragraph()
+                add_paragraph()
                 
             elif self._contains_severity_indicator(line):
                 # Severity indicators - handle with proper formatting
-                p = doc.add_paragraph()
+                p = add_paragraph()
                 self._add_severity_formatted_text(p, line)
                 
             elif line.startswith('**Analysis Overview:**'):
                 # NEW: Special handling for analysis overview/explanation sections
-                p = doc.add_paragraph()
+                p = add_paragraph()
                 self._add_analysis_overview_text(p, line)
                         
             else:
@@ -244,26 +265,39 @@ class WordExporter:
                 if line:
                     # Handle paragraphs with embedded formatting
                     if '**' in line:
-                        p = doc.add_paragraph()
+                        p = add_paragraph()
                         if in_processing_summary:
-                            p.style = 'Processing Summary'
+                            p.style = summary_style
                         self._add_formatted_text_to_paragraph(p, line)
                     else:
-                        style_name = 'Processing Summary' if in_processing_summary else 'Normal'
-                        doc.add_paragraph(line, style=style_name)
+                        add_paragraph(line, style=summary_style if in_processing_summary else normal_style)
+
+    def _add_formatted_text_to_paragraph(self, paragraph, text):
+        """Add text with embedded bold formatting to a paragraph."""
+        # Split text by bold markers
+        parts = _BOLD_SPLIT_RE.split(text)
+        
+        for part in parts:
+            if part.startswith('**') and part.endswith('**') and len(part) > 4:
+                # Bold text
+                run = paragraph.add_run(part[2:-2])
+                run.bold = True
+            elif part:
+                # Regular text
+                paragraph.add_run(part)
 
     def _add_explanation_formatted_text(self, paragraph, text):
         """
         Add explanation text with special formatting for Google Docs compatibility.
         NEW: Handles the explanation field with enhanced styling
         """
-        # Split by the explanation marker
-        if '**Explanation:**' in text:
-            parts = text.split('**Explanation:**', 1)
-            
+        # Split by the explanation marker (one scan finds and splits)
+        label, marker, explanation = text.partition('**Explanation:**')
+        if marker:
             # Add the label part
-            if parts[0].strip():
-                paragraph.add_run(parts[0].strip() + ' ')
+            label = label.strip()
+            if label:
+                paragraph.add_run(label + ' ')
             
             # Add "Explanation:" in bold
             explanation_label = paragraph.add_run('Explanation:')
@@ -271,8 +305,9 @@ class WordExporter:
             explanation_label.font.color.rgb = RGBColor(54, 95, 145)  # Professional blue
             
             # Add the explanation content
-            if len(parts) > 1 and parts[1].strip():
-                explanation_content = paragraph.add_run(' ' + parts[1].strip())
+            explanation = explanation.strip()
+            if explanation:
+                explanation_content = paragraph.add_run(' ' + explanation)
                 explanation_content.font.italic = True
                 explanation_content.font.color.rgb = RGBColor(68, 68, 68)  # Dark gray
         else:
@@ -284,10 +319,9 @@ class WordExporter:
         Add analysis overview text with special formatting.
         NEW: Handles section-level explanations
         """
-        # Split by the overview marker
-        if '**Analysis Overview:**' in text:
-            parts = text.split('**Analysis Overview:**', 1)
-            
+        # Split by the overview marker (one scan finds and splits)
+        _, marker, overview = text.partition('**Analysis Overview:**')
+        if marker:
             # Add "Analysis Overview:" in bold with special color
             overview_label = paragraph.add_run('Analysis Overview:')
             overview_label.bold = True
@@ -295,8 +329,9 @@ class WordExporter:
             overview_label.font.size = Pt(12)  # Slightly larger
             
             # Add the overview content
-            if len(parts) > 1 and parts[1].strip():
-                overview_content = paragraph.add_run(' ' + parts[1].strip())
+            overview = overview.strip()
+            if overview:
+                overview_content = paragraph.add_run(' ' + overview)
                 overview_content.font.italic = True
                 overview_content.font.color.rgb = RGBColor(33, 33, 33)  # Dark text
                 
@@ -317,40 +352,27 @@ class WordExporter:
         Returns:
             bool: True if contains severity indicators
         """
-        return any(indicator in line for indicator in ['🔴', '🟠', '🟡', '🔵', '✅', '❌'])
+        return _SEVERITY_INDICATOR_RE.search(line) is not None
 
     def _add_severity_formatted_text(self, paragraph, text):
         """
         Add severity indicator text with proper formatting and color.
         ENHANCED: Replace emojis with text for better Google Docs compatibility + high severity
         """
-        # Replace emoji with text for better Word/Google Docs compatibility
-        emoji_replacements = {
-            '🔴': '[CRITICAL]',
-            '🟠': '[HIGH]',      # NEW: Added high severity
-            '🟡': '[MEDIUM]',
-            '🔵': '[LOW]',
-            '✅': '[✓]',
-            '❌': '[✗]',
-            '⚠️': '[!]'
-        }
+        # Apply emoji replacements in a single scan, noting which emoji were present
+        found_emoji = set()
         
-        # Apply emoji replacements
-        display_text = text
-        severity_color = None
+        def replace_emoji(match):
+            found_emoji.add(match.group(0))
+            return _SEVERITY_EMOJI_REPLACEMENTS[match.group(0)]
         
-        for emoji, replacement in emoji_replacements.items():
-            if emoji in display_text:
-                display_text = display_text.replace(emoji, replacement)
-                # Set color based on severity
-                if emoji == '🔴':
-                    severity_color = RGBColor(231, 76, 60)  # Red
-                elif emoji == '🟠':
-                    severity_color = RGBColor(255, 152, 0)  # Orange - NEW
-                elif emoji == '🟡':
-                    severity_color = RGBColor(243, 156, 18)  # Yellow/Gold
-                elif emoji == '🔵':
-                    severity_color = RGBColor(52, 152, 219)  # Blue
+        display_text = _SEVERITY_EMOJI_REPLACEMENTS_RE.sub(replace_emoji, text)
+        
+        # Set color based on severity (status emoji keep the current color)
+        severity_color = None
+        for emoji, color in _SEVERITY_COLORS.items():
+            if emoji in found_emoji:
+                severity_color = color
         
         # Add the text with formatting
         if '**' in display_text:
@@ -364,18 +386,6 @@ class WordExporter:
                 run.font.color.rgb = severity_color
                 run.bold = True  # Make severity indicators bold
 
-    def _contains_severity_indicator(self, line: str) -> bool:
-        """
-        Check if line contains severity indicators.
-        
-        Args:
-            line (str): Line to check
-            
-        Returns:
-            bool: True if contains severity indicators
-        """
-        return any(indicator in line for indicator in ['🔴', '🟠', '🟡', '🔵', '✅', '❌'])
-
     def _get_severity_style(self, line: str) -> Optional[str]:
         """
         Get appropriate style for severity line.
@@ -518,11 +528,24 @@ class WordExporter:
         try:
             lines = markdown_content.split('\n')
             
-            # Count different elements
-            headings = len([line for line in lines if line.strip().startswith('#')])
-            paragraphs = len([line for line in lines if line.strip() and not line.strip().startswith('#') and not line.strip().startswith('-')])
-            bullet_points = len([line for line in lines if line.strip().startswith('-') or line.strip().startswith('*')])
-            severity_indicators = len([line for line in lines if self._contains_severity_indicator(line)])
+            # Count different elements in a single pass (one strip per line)
+            headings = paragraphs = bullet_points = severity_indicators = 0
+            for line in lines:
+                stripped = line.strip()
+                if not stripped:
+                    continue
+                
+                first_char = stripped[0]
+                if first_char == '#':
+                    headings += 1
+                else:
+                    if first_char != '-':
+                        paragraphs += 1
+                    if first_char in '-*':
+                        bullet_points += 1
+                
+                if _SEVERITY_INDICATOR_RE.search(line):
+                    severity_indicators += 1
             
             return {
                 'total_lines': len(lines),
@@ -57,18 +57,25 @@ class ContentExtractor:
         logger.info(f"Starting content extraction from: {url}")
         
         try:
-            # Fetch the page
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            
-            # Check content length
-            content_length = len(response.content)
-            if content_length > MAX_CONTENT_LENGTH:
-                logger.warning(f"Content length ({content_length:,} bytes) exceeds maximum ({MAX_CONTENT_LENGTH:,} bytes)")
-                return False, None, f"Content too large: {content_length:,} bytes (max: {MAX_CONTENT_LENGTH:,})"
+            # Fetch the page - streamed so oversized pages are rejected without buffering them
+            with self.session.get(url, timeout=self.timeout, stream=True) as response:
+                response.raise_for_status()
+                
+                # Check declared content length before downloading the body
+                declared_length = response.headers.get('content-length', '')
+                if declared_length.isdigit() and int(declared_length) > MAX_CONTENT_LENGTH:
+                    content_length = int(declared_length)
+                    logger.warning(f"Content length ({content_length:,} bytes) exceeds maximum ({MAX_CONTENT_LENGTH:,} bytes)")
+                    return False, None, f"Content too large: {content_length:,} bytes (max: {MAX_CONTENT_LENGTH:,})"
+                
+                # Check actual content length while reading
+                page_content = self._read_limited(response, MAX_CONTENT_LENGTH)
+                if page_content is None:
+                    logger.warning(f"Content length exceeds maximum ({MAX_CONTENT_LENGTH:,} bytes), download stopped")
+                    return False, None, f"Content too large: over {MAX_CONTENT_LENGTH:,} bytes (max: {MAX_CONTENT_LENGTH:,})"
             
             # Parse HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(page_content, 'html.parser')
             
             # Extract structured content
             content_parts = self._extract_structured_content(soup)
@@ -104,6 +111,26 @@ class ContentExtractor:
             logger.error(error_msg)
             return False, None, error_msg
 
+    def _read_limited(self, response: requests.Response, limit: int) -> Optional[bytes]:
+        """
+        Read a streamed response body, giving up as soon as it exceeds the limit.
+        
+        Args:
+            response (requests.Response): Response opened with stream=True
+            limit (int): Maximum number of bytes to accept
+            
+        Returns:
+            bytes or None: Body content, or None if it is larger than the limit
+        """
+        parts = []
+        received = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            received += len(chunk)
+            if received > limit:
+                return None
+            parts.append(chunk)
+        return b''.join(parts)
+
     def _extract_structured_content(self, soup: BeautifulSoup) -> list:
         """
         Extract structured content from BeautifulSoup object.
@@ -8,6 +8,8 @@ Uses Selenium WebDriver for browser automation.
 ENHANCED: Improved Unicode handling to prevent surrogate pair errors
 """
 
+import re
+import json
 import time
 import html
 import platform
@@ -22,13 +24,16 @@ from selenium.common.exceptions import TimeoutException, WebDriverException
 from config.settings import (
     CHUNK_API_URL, SELENIUM_TIMEOUT, SELENIUM_SHORT_TIMEOUT,
     CHROME_OPTIONS, CHUNK_POLLING_INTERVAL, CHUNK_POLLING_TIMEOUT,
-    MAX_CONTENT_LENGTH
+    MAX_CONTENT_LENGTH, DIRECT_INPUT_BATCH_SIZE
 )
 from utils.logging_utils import setup_logger, format_processing_step
-from utils.json_utils import decode_unicode_escapes, clean_surrogate_pairs  # ENHANCED: Import new functions
+from utils.json_utils import decode_unicode_escapes, clean_surrogate_pairs, validate_json_syntax  # ENHANCED: Import new functions
 
 logger = setup_logger(__name__)
 
+# Literal \uXXXX escape sequences (compiled once, used by validate_unicode_safety)
+_UNICODE_ESCAPE_RE = re.compile(r'\\u([0-9a-fA-F]{4})')
+
 
 class ChunkProcessor:
     """
@@ -199,7 +204,6 @@ class ChunkProcessor:
                 
                 # Fallback: Try with JSON.stringify for safe escaping
                 try:
-                    import json
                     json_escaped = json.dumps(cleaned_content)
                     js_code = f"navigator.clipboard.writeText({json_escaped});"
                     self.driver.execute_script(js_code)
@@ -230,12 +234,13 @@ class ChunkProcessor:
                     
                     # Fallback: Direct text input (slower but more reliable)
                     input_field.clear()
-                    # Send in smaller chunks to avoid issues
-                    chunk_size = 1000
+                    # Send in batches to avoid issues; each send_keys is a WebDriver
+                    # round trip plus a pause, so batches are kept large
+                    chunk_size = DIRECT_INPUT_BATCH_SIZE
                     for i in range(0, len(cleaned_content), chunk_size):
                         chunk = cleaned_content[i:i + chunk_size]
                         input_field.send_keys(chunk)
-                        time.sleep(0.1)  # Small delay between chunks
+                        time.sleep(0.1)  # Small delay between batches
                     
                     self._log("Content entered using direct input method", "success")
                 else:
@@ -313,15 +318,16 @@ class ChunkProcessor:
             self._log("Polling button attribute for completeness", "in_progress")
             
             # Poll for complete content
-            timeout = time.time() + CHUNK_POLLING_TIMEOUT
+            timeout = time.monotonic() + CHUNK_POLLING_TIMEOUT
             final_content = ""
             
-            while time.time() < timeout:
+            while time.monotonic() < timeout:
                 raw_content = copy_button.get_attribute('data-clipboard-text')
                 
-                if raw_content and raw_content.strip():
-                    # Check if content looks like complete JSON
-                    if raw_content.strip().startswith('{') and raw_content.strip().endswith('}'):
+                if raw_content:
+                    # Check if content looks like complete JSON (strip once per poll)
+                    stripped_content = raw_content.strip()
+                    if stripped_content.startswith('{') and stripped_content.endswith('}'):
                         final_content = raw_content
                         break
                 
@@ -453,17 +459,18 @@ class ChunkProcessor:
             try:
                 # Test that the output can be safely used
                 json_output.encode('utf-8')
-                import json
-                json.loads(json_output)  # Validate it's proper JSON
+                
+                # Validate it's proper JSON (syntax only - the caller parses it once later)
+                is_valid_json, json_error = validate_json_syntax(json_output)
+                if not is_valid_json:
+                    self._log(f"Final JSON validation failed: {json_error}", "error")
+                    return False, None, "Output is not valid JSON"
                 
                 self._log("Final validation passed - output is safe and valid", "success")
                 
             except UnicodeEncodeError as encoding_error:
                 self._log(f"Final encoding validation failed: {encoding_error}", "error")
                 return False, None, "Output contains unsafe Unicode characters"
-            except json.JSONDecodeError as json_error:
-                self._log(f"Final JSON validation failed: {json_error}", "error")
-                return False, None, "Output is not valid JSON"
             except Exception as validation_error:
                 self._log(f"Final validation failed: {validation_error}", "error")
                 return False, None, f"Output validation failed: {validation_error}"
@@ -542,8 +549,7 @@ class ChunkProcessor:
                 results['errors'].append(f"UTF-8 encoding error: {e}")
             
             # Check for surrogates in Unicode escapes
-            import re
-            unicode_matches = re.findall(r'\\u([0-9a-fA-F]{4})', text)
+            unicode_matches = _UNICODE_ESCAPE_RE.findall(text)
             surrogate_count = 0
             
             for match in unicode_matches:
@@ -8,12 +8,37 @@ import streamlit_js_eval as st_js
 import streamlit as st
 import time
 import re
+import json
+from collections import deque
 from datetime import datetime
 from typing import Dict, Any, Optional, List, Callable, Tuple
-from config.settings import DEFAULT_TIMEZONE
+from config.settings import DEFAULT_TIMEZONE, UI_SETTINGS
 from utils.logging_utils import log_with_timestamp
-from utils.json_utils import get_display_json_string
+from utils.json_utils import get_display_json_string, fast_json_loads
 from exporters.word_exporter import WordExporter
+from ai.response_cache import get_response_cache
+# Severity level -> emoji, shared by every violation row
+_SEVERITY_EMOJI = {
+    "critical": "🔴",
+    "high": "🟠",
+    "medium": "🟡",
+    "low": "🔵"
+}
+# Severity emoji found in one scan instead of one substring pass per emoji
+_SEVERITY_EMOJI_RE = re.compile('[🔴🟠🟡🔵]')
+# Emoji -> plain-text labels for the text export (built once, not per line)
+_SEVERITY_TEXT_REPLACEMENTS = {
+    '🔴': 'CRITICAL:',
+    '🟠': 'HIGH:',
+    '🟡': 'MEDIUM:',
+    '🔵': 'LOW:',
+    '✅': 'OK',
+    '❌': 'FAIL',
+    '⚠️': 'WARN'
+}
+# All of the above matched in one pass; the emoji-only subset is what the fallback cleanup replaces
+_SEVERITY_TEXT_RE = re.compile('|'.join(map(re.escape, _SEVERITY_TEXT_REPLACEMENTS)))
+_SEVERITY_TEXT_BASIC_RE = re.compile('[🔴🟠🟡🔵✅❌]')
 def create_page_header():
     """Create the main page header with title and description."""
     st.title("🕵 YMYL Audit Tool")
@@ -140,6 +165,17 @@ def create_sidebar_config(debug_mode_default: bool = True) -> Dict[str, Any]:
             for key in keys_to_clear:
                 del st.session_state[key]
             st.success(f"Cleared {len(keys_to_clear)} session keys")
+    # The response cache is shared by every session on this server, so clearing it is a
+    # global action - only offered in debug mode and kept apart from per-session cleanup
+    if debug_mode:
+        with st.sidebar.expander("⚠️ Shared Response Cache"):
+            st.caption("Applies to all users of this app, not just your session.")
+            if st.button("Clear Cached AI Responses for All Users",
+                         help="Forget every stored AI analysis on this server so identical content is re-analyzed"):
+                response_cache = get_response_cache()
+                if response_cache:
+                    response_cache.clear()
+                st.success("Cached AI responses cleared for all users")
     # API Key configuration
     st.sidebar.markdown("### 🔑 AI Analysis Configuration")
     # Try to get API key from secrets first
@@ -157,9 +193,17 @@ def create_sidebar_config(debug_mode_default: bool = True) -> Dict[str, Any]:
             st.sidebar.success("✅ API Key provided")
         else:
             st.sidebar.warning("⚠️ API Key needed for AI analysis")
+    # Response cache toggle (re-running unchanged content reuses the stored analysis)
+    use_cache = st.sidebar.checkbox(
+        "♻️ Reuse Cached Analyses",
+        value=True,
+        help="Serve identical content from the response cache instead of calling the AI again. "
+             "When unchecked, the content is re-analyzed and the stored result is replaced."
+    )
     return {
         'debug_mode': debug_mode,
-        'api_key': api_key
+        'api_key': api_key,
+        'use_cache': use_cache
     }
 def create_how_it_works_section():
     """Create the 'How it works' information section with user guidance."""
@@ -366,24 +410,19 @@ The tool will automatically chunk this content using the Dejan chunking service,
 
 def create_debug_logger(placeholder) -> Callable[[str], None]:
     """Create debug logger function for detailed logging."""
-    log_lines = []
+    # Bounded ring buffer: old lines drop off in O(1) instead of list.pop(0)
+    log_lines = deque(maxlen=UI_SETTINGS.get('MAX_LOG_LINES', 50))
     def log_callback(message: str):
-        timestamped_msg = log_with_timestamp(message, DEFAULT_TIMEZONE)
-        log_lines.append(timestamped_msg)
-        # Limit log lines to prevent memory issues
-        if len(log_lines) > 50:
-            log_lines.pop(0)
+        log_lines.append(log_with_timestamp(message, DEFAULT_TIMEZONE))
         placeholder.info("\n".join(log_lines))
     return log_callback
 def create_simple_progress_tracker() -> tuple[Any, Callable[[str], None]]:
     """Create simple progress tracker for non-debug mode."""
     log_area = st.empty()
-    milestones = []
+    # Limit milestone history
+    milestones = deque(maxlen=10)
     def update_progress(text: str):
         milestones.append(f"- {text}")
-        # Limit milestone history
-        if len(milestones) > 10:
-            milestones.pop(0)
         log_area.markdown("\n".join(milestones))
     return log_area, update_progress
 def create_ai_analysis_section(api_key: Optional[str], json_output: Any, source_result: Optional[Dict] = None) -> bool:
@@ -403,8 +442,7 @@ def create_ai_analysis_section(api_key: Optional[str], json_output: Any, source_
             if isinstance(json_output, dict):
                 data = json_output
             else:
-                import json
-                data = json.loads(json_output)
+                data = fast_json_loads(json_output)
             chunk_count = len(data.get('big_chunks', []))
             
             col1, col2 = st.columns([2, 1])
@@ -459,90 +497,6 @@ def create_ai_analysis_section(api_key: Optional[str], json_output: Any, source_
         return False
 
 
-def _create_ai_report_tab(ai_result: Dict[str, Any], content_result: Optional[Dict[str, Any]] = None):
-    """
-    Create AI compliance report tab.
-    UPDATED: Single request architecture messaging
-    """
-    st.markdown("### YMYL Compliance Analysis Report")
-    
-    ai_report = ai_result['report']
-    
-    # Show report statistics
-    try:
-        ai_response = ai_result.get('ai_response', [])
-        if isinstance(ai_response, list):
-            total_violations = 0
-            sections_with_violations = 0
-            
-            for section in ai_response:
-                violations = section.get('violations', [])
-                if violations != "no violation found" and violations:
-                    sections_with_violations += 1
-                    total_violations += len(violations)
-            
-            st.markdown("#### 📊 Analysis Overview")
-            overview_col1, overview_col2, overview_col3 = st.columns(3)
-            
-            with overview_col1:
-                st.metric("Total Violations", total_violations)
-            with overview_col2:
-                st.metric("Sections with Issues", sections_with_violations)
-            with overview_col3:
-                st.metric("Total Sections", len(ai_response))
-            
-            if total_violations > 0:
-                st.info(f"🔍 **Single Request Analysis**: Found {total_violations} compliance issues across {sections_with_violations} content sections.")
-            else:
-                st.success("✅ **Clean Analysis**: No YMYL compliance violations found in any content section.")
-        
-    except Exception as e:
-        st.warning(f"Could not generate analysis overview: {e}")
-    
-    st.markdown("---")
-    
-    # Word download section
-    st.markdown("#### 📄 Download Report")
-    try:
-        from exporters.word_exporter import WordExporter
-        word_exporter = WordExporter()
-        word_bytes = word_exporter.convert(ai_report, "YMYL Compliance Audit Report")
-        
-        timestamp = int(time.time())
-        filename = f"ymyl_compliance_report_{timestamp}.docx"
-        
-        col1, col2, col3 = st.columns([1, 2, 1])
-        with col2:
-            st.download_button(
-                label="📄 Download Word Document",
-                data=word_bytes,
-                file_name=filename,
-                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                help="Single request analysis report - imports perfectly into Google Docs",
-                type="primary",
-                use_container_width=True
-            )
-        
-        st.success("✅ **Ready to download!** Single request analysis with perfect Google Docs formatting.")
-        
-    except Exception as e:
-        st.error(f"Error creating Word document: {e}")
-        timestamp = int(time.time())
-        st.download_button(
-            label="📝 Download Report (Markdown Fallback)",
-            data=ai_report,
-            file_name=f"ymyl_compliance_report_{timestamp}.md",
-            mime="text/markdown"
-        )
-    
-    # View options
-    with st.expander("📖 View Formatted Report"):
-        st.markdown(ai_report)
-    
-    with st.expander("📝 View Raw Markdown"):
-        st.code(ai_report, language='markdown')
-
-
 def _create_individual_analyses_tab(ai_result: Dict[str, Any]):
     """
     Create AI analysis details tab.
@@ -594,12 +548,7 @@ def _create_individual_analyses_tab(ai_result: Dict[str, Any]):
                         
                         for i, violation in enumerate(violations, 1):
                             severity = violation.get('severity', 'medium')
-                            severity_emoji = {
-                                "critical": "🔴",
-                                "high": "🟠", 
-                                "medium": "🟡",
-                                "low": "🔵"
-                            }.get(severity, "🟡")
+                            severity_emoji = _SEVERITY_EMOJI.get(severity, "🟡")
                             
                             st.write(f"{severity_emoji} **{violation.get('violation_type', 'Unknown')}** ({severity})")
                             
@@ -615,77 +564,22 @@ def _create_individual_analyses_tab(ai_result: Dict[str, Any]):
             st.error(f"Error processing section: {e}")
 
 
-def _create_summary_tab(result: Dict[str, Any], ai_result: Optional[Dict[str, Any]] = None):
+def _calculate_chunk_stats(big_chunks: List[Dict[str, Any]]) -> Tuple[int, int]:
     """
-    Create processing summary tab.
-    UPDATED: Single request architecture metrics
-    """
-    st.subheader("Processing Summary")
-    input_mode = st.session_state.get('input_mode', '🌐 URL Input')
+    Count small chunks and their newline-joined content length in one pass.
     
-    # Parse JSON for chunk statistics
-    try:
-        json_output_dict = result.get('json_output', {})
-        if isinstance(json_output_dict, dict):
-            big_chunks = json_output_dict.get('big_chunks', [])
-        else:
-            import json
-            if isinstance(json_output_dict, str):
-                parsed_data = json.loads(json_output_dict)
-                big_chunks = parsed_data.get('big_chunks', [])
-            else:
-                big_chunks = []
-        
-        total_small_chunks = sum(len(chunk.get('small_chunks', [])) for chunk in big_chunks)
-        
-        # Content processing metrics
-        if input_mode == "🌐 URL Input":
-            st.markdown("#### URL Content Extraction")
-            colA, colB, colC = st.columns(3)
-            colA.metric("Big Chunks", len(big_chunks))
-            colB.metric("Total Small Chunks", total_small_chunks)
-            colC.metric("Extracted Length", f"{len(result.get('extracted_content', '')):,} chars")
-        elif input_mode == "📄 Direct JSON":
-            st.markdown("#### Direct JSON Input")
-            colA, colB, colC = st.columns(3)
-            colA.metric("Big Chunks", len(big_chunks))
-            colB.metric("Total Small Chunks", total_small_chunks)
-            total_content = sum(len('\n'.join(chunk.get('small_chunks', []))) for chunk in big_chunks)
-            colC.metric("Total Content", f"{total_content:,} chars")
-        elif input_mode == "📝 Raw Content":
-            st.markdown("#### Raw Content Chunking")
-            colA, colB, colC = st.columns(3)
-            colA.metric("Big Chunks Created", len(big_chunks))
-            colB.metric("Total Small Chunks", total_small_chunks)
-            colC.metric("Original Length", f"{len(result.get('extracted_content', '')):,} chars")
-        
-        # AI Analysis metrics (UPDATED for single request)
-        if ai_result and ai_result.get('success'):
-            st.markdown("#### AI Analysis Performance")
-            processing_time = ai_result.get('processing_time', 0)
-            
-            colD, colE, colF = st.columns(3)
-            colD.metric("Processing Time", f"{processing_time:.2f}s")
-            colE.metric("Analysis Mode", "Single Request")
-            colF.metric("API Calls", "1")
-            
-            # Performance insights
-            if processing_time > 0 and len(big_chunks) > 0:
-                avg_time_per_chunk = processing_time / len(big_chunks)
-                efficiency = "Excellent" if processing_time < 60 else "Good" if processing_time < 180 else "Slow"
-                st.info(f"📊 **Performance**: {avg_time_per_chunk:.2f}s per section | Efficiency: {efficiency}")
-        
-    except Exception as e:
-        st.warning(f"Could not parse JSON for statistics: {e}")
-    
-    # Show source information
-    if input_mode == "🌐 URL Input":
-        source_info = result.get('url', 'Unknown URL')
-        st.info(f"**Source**: {source_info}")
-    elif input_mode == "📄 Direct JSON":
-        st.info("**Source**: Direct JSON Input")
-    elif input_mode == "📝 Raw Content":
-        st.info("**Source**: Raw Content → Chunked via Dejan Service")
+    Returns:
+        tuple: (total_small_chunks, total_content_chars)
+    """
+    total_small_chunks = 0
+    total_content = 0
+    for chunk in big_chunks:
+        small_chunks = chunk.get('small_chunks', [])
+        if small_chunks:
+            total_small_chunks += len(small_chunks)
+            # Same as len('\n'.join(small_chunks)) without building the joined string
+            total_content += sum(map(len, small_chunks)) + len(small_chunks) - 1
+    return total_small_chunks, total_content
 
 
 def create_results_tabs(result: Dict[str, Any], ai_result: Optional[Dict[str, Any]] = None):
@@ -761,10 +655,7 @@ def _create_content_tab(result: Dict[str, Any]):
             json_output_dict = result.get('json_output', {})
             if isinstance(json_output_dict, dict):
                 chunks = json_output_dict.get('big_chunks', [])
-                total_content = 0
-                for chunk in chunks:
-                    small_chunks = chunk.get('small_chunks', [])
-                    total_content += len('\n'.join(small_chunks))
+                _, total_content = _calculate_chunk_stats(chunks)
                 col1, col2 = st.columns(2)
                 with col1:
                     st.metric("Total Chunks Provided", len(chunks))
@@ -785,13 +676,14 @@ def _create_content_tab(result: Dict[str, Any]):
         # Show content statistics
         raw_content = result.get('extracted_content', '')
         if raw_content:
+            line_count = raw_content.count('\n') + 1
             col1, col2, col3 = st.columns(3)
             with col1:
                 st.metric("Original Characters", f"{len(raw_content):,}")
             with col2:
                 st.metric("Original Words", f"{len(raw_content.split()):,}")
             with col3:
-                st.metric("Original Lines", f"{len(raw_content.split('\n')):,}")
+                st.metric("Original Lines", f"{line_count:,}")
 def _create_summary_tab(result: Dict[str, Any], ai_result: Optional[Dict[str, Any]] = None):
     """
     Create processing summary tab content.
@@ -809,13 +701,12 @@ def _create_summary_tab(result: Dict[str, Any], ai_result: Optional[Dict[str, An
         if isinstance(json_output_dict, dict):
             big_chunks = json_output_dict.get('big_chunks', [])
         else:
-            import json
             if isinstance(json_output_dict, str):
-                parsed_data = json.loads(json_output_dict)
+                parsed_data = fast_json_loads(json_output_dict)
                 big_chunks = parsed_data.get('big_chunks', [])
             else:
                 big_chunks = []
-        total_small_chunks = sum(len(chunk.get('small_chunks', [])) for chunk in big_chunks)
+        total_small_chunks, total_content = _calculate_chunk_stats(big_chunks)
         # Content processing metrics - enhanced for all three modes
         if input_mode == "🌐 URL Input":
             st.markdown("#### URL Content Extraction")
@@ -828,7 +719,6 @@ def _create_summary_tab(result: Dict[str, Any], ai_result: Optional[Dict[str, An
             colA, colB, colC = st.columns(3)
             colA.metric("Big Chunks", len(big_chunks))
             colB.metric("Total Small Chunks", total_small_chunks)
-            total_content = sum(len('\n'.join(chunk.get('small_chunks', []))) for chunk in big_chunks)
             colC.metric("Total Content", f"{total_content:,} chars")
         elif input_mode == "📝 Raw Content":
             st.markdown("#### Raw Content Chunking")
@@ -877,6 +767,21 @@ def _create_summary_tab(result: Dict[str, Any], ai_result: Optional[Dict[str, An
         st.info("**Source**: Direct JSON Input")
     elif input_mode == "📝 Raw Content":
         st.info("**Source**: Raw Content → Chunked via Dejan Service")
+def _get_word_document(ai_report: str) -> bytes:
+    """
+    Get the Word export for a report, building it only when the report changes.
+    Streamlit reruns this tab on every widget interaction, which would otherwise
+    re-parse the whole markdown report into a new document each time.
+    """
+    # Keyed by the report text itself - comparing it is cheap next to the conversion.
+    # The 'ai_' prefix lets "Clear All Analysis Data" remove it with the other results.
+    cached = st.session_state.get('ai_word_export_cache')
+    if cached and cached[0] == ai_report:
+        return cached[1]
+    word_exporter = WordExporter()
+    word_bytes = word_exporter.convert(ai_report, "YMYL Compliance Audit Report")
+    st.session_state['ai_word_export_cache'] = (ai_report, word_bytes)
+    return word_bytes
 def _create_ai_report_tab(ai_result: Dict[str, Any], content_result: Optional[Dict[str, Any]] = None):
     """Create AI compliance report tab content with Word-only export."""
     st.markdown("### YMYL Compliance Analysis Report")
@@ -884,9 +789,8 @@ def _create_ai_report_tab(ai_result: Dict[str, Any], content_result: Optional[Di
     # Word download section
     st.markdown("#### 📄 Download Report")
     try:
-        # Generate Word document
-        word_exporter = WordExporter()
-        word_bytes = word_exporter.convert(ai_report, "YMYL Compliance Audit Report")
+        # Generate Word document (once per report, not on every rerun)
+        word_bytes = _get_word_document(ai_report)
         # Download button
         timestamp = int(time.time())
         filename = f"ymyl_compliance_report_{timestamp}.docx"
@@ -975,6 +879,13 @@ def _add_copy_functionality(ai_report: str):
                     )
         with col2:
             st.info("**💡 Tip:** This creates clean, formatted text perfect for pasting into emails, documents, or other applications.")
+# Plain-text renderers for line-leading markdown tokens, keyed by the token
+_CLEAN_TEXT_PREFIX_HANDLERS = {
+    '#': lambda title: [title, '=' * len(title)],           # Main title (# Title)
+    '##': lambda header: ['', header, '-' * len(header)],   # Section headers (## Section)
+    '###': lambda subheader: ['', subheader],               # Subsection headers (### Subsection)
+    '-': lambda bullet_text: [f"• {bullet_text}"],          # Bullet points (- item)
+}
 def _convert_markdown_to_clean_text(markdown_content: str) -> str:
     """Convert markdown to clean, readable text for copying."""
     try:
@@ -984,22 +895,11 @@ def _convert_markdown_to_clean_text(markdown_content: str) -> str:
             if not line.strip():
                 formatted_lines.append('')
                 continue
-            # Main title (# Title)
-            if line.startswith('# '):
-                title = line[2:].strip()
-                formatted_lines.append(f"{title}")
-                formatted_lines.append('=' * len(title))
-            # Section headers (## Section)
-            elif line.startswith('## '):
-                header = line[3:].strip()
-                formatted_lines.append('')
-                formatted_lines.append(f"{header}")
-                formatted_lines.append('-' * len(header))
-            # Subsection headers (### Subsection)
-            elif line.startswith('### '):
-                subheader = line[4:].strip()
-                formatted_lines.append('')
-                formatted_lines.append(f"{subheader}")
+            # Headers and bullets: dispatch on the first token instead of a startswith chain
+            marker, separator, rest = line.partition(' ')
+            prefix_handler = _CLEAN_TEXT_PREFIX_HANDLERS.get(marker) if separator else None
+            if prefix_handler:
+                formatted_lines.extend(prefix_handler(rest.strip()))
             # Horizontal rules (---)
             elif line.startswith('---'):
                 formatted_lines.append('')
@@ -1010,12 +910,8 @@ def _convert_markdown_to_clean_text(markdown_content: str) -> str:
                 bold_text = line[2:-2].strip()
                 formatted_lines.append('')
                 formatted_lines.append(f"{bold_text.upper()}")
-            # Bullet points (- item)
-            elif line.startswith('- '):
-                bullet_text = line[2:].strip()
-                formatted_lines.append(f"• {bullet_text}")
             # Violations with severity (replace emojis with text)
-            elif any(emoji in line for emoji in ['🔴', '🟠', '🟡', '🔵']):
+            elif _SEVERITY_EMOJI_RE.search(line):
                 formatted_line = _format_severity_for_text(line)
                 formatted_lines.append(f"    {formatted_line}")
             # Regular paragraphs
@@ -1026,144 +922,64 @@ def _convert_markdown_to_clean_text(markdown_content: str) -> str:
                     formatted_lines.append(clean_line)
         # Join and clean up excessive whitespace
         result = '\n'.join(formatted_lines)
-        result = re.sub(r'\n{3,}', '\n\n', result)
+        result = _EXCESS_BLANK_LINES_RE.sub('\n\n', result)
         return result.strip()
     except Exception as e:
         # Fallback: basic cleanup
         return _basic_markdown_cleanup(markdown_content)
 def _format_severity_for_text(line: str) -> str:
     """Format severity lines for plain text."""
-    severity_replacements = {
-        '🔴': 'CRITICAL:',
-        '🟠': 'HIGH:',
-        '🟡': 'MEDIUM:',
-        '🔵': 'LOW:',
-        '✅': 'OK',
-        '❌': 'FAIL',
-        '⚠️': 'WARN'
-    }
-    formatted_line = line
-    for emoji, replacement in severity_replacements.items():
-        formatted_line = formatted_line.replace(emoji, replacement)
+    formatted_line = _SEVERITY_TEXT_RE.sub(lambda m: _SEVERITY_TEXT_REPLACEMENTS[m.group()], line)
     # Clean up any remaining markdown
     formatted_line = _clean_markdown_syntax(formatted_line)
     return formatted_line
+# Markdown cleanup patterns, compiled once at import instead of on every line
+_BOLD_RE = re.compile(r'\*\*(.*?)\*\*')                 # **bold** → bold
+_ITALIC_RE = re.compile(r'\*(.*?)\*')                     # *italic* → italic
+_LINK_RE = re.compile(r'\[([^\]]+)\]\([^\)]+\)')           # [text](url) → text
+_CODE_RE = re.compile(r'`([^`]+)`')                       # `code` → code
+_EXCESS_BLANK_LINES_RE = re.compile(r'\n{3,}')
+_H1_LINE_RE = re.compile(r'^# (.+)', re.MULTILINE)
+_H2_LINE_RE = re.compile(r'^## (.+)', re.MULTILINE)
+_H3_LINE_RE = re.compile(r'^### (.+)', re.MULTILINE)
+_BULLET_LINE_RE = re.compile(r'^- (.+)', re.MULTILINE)
 def _clean_markdown_syntax(text: str) -> str:
     """Remove markdown syntax while preserving formatting intent."""
-    # Remove bold/italic markers but keep the text
-    text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)  # **bold** → bold
-    text = re.sub(r'\*(.*?)\*', r'\1', text)      # *italic* → italic
-    # Remove link syntax but keep the text
-    text = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', text)  # [text](url) → text
-    # Remove code syntax
-    text = re.sub(r'`([^`]+)`', r'\1', text)  # `code` → code
+    # Each pattern needs its marker character; plain lines skip straight to spacing
+    if '*' in text:
+        # Remove bold/italic markers but keep the text
+        text = _BOLD_RE.sub(r'\1', text)
+        text = _ITALIC_RE.sub(r'\1', text)
+    if '[' in text:
+        # Remove link syntax but keep the text
+        text = _LINK_RE.sub(r'\1', text)
+    if '`' in text:
+        # Remove code syntax
+        text = _CODE_RE.sub(r'\1', text)
     # Clean up extra spaces
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = ' '.join(text.split())
     return text
 def _basic_markdown_cleanup(markdown_content: str) -> str:
     """Basic fallback cleanup if main formatting fails."""
     try:
         content = markdown_content
         # Convert headers
-        content = re.sub(r'^# (.+)', r'\1\n' + '=' * 50, content, flags=re.MULTILINE)
-        content = re.sub(r'^## (.+)', r'\n\1\n' + '-' * 30, content, flags=re.MULTILINE)
-        content = re.sub(r'^### (.+)', r'\n\1', content, flags=re.MULTILINE)
+        content = _H1_LINE_RE.sub(r'\1\n' + '=' * 50, content)
+        content = _H2_LINE_RE.sub(r'\n\1\n' + '-' * 30, content)
+        content = _H3_LINE_RE.sub(r'\n\1', content)
         # Convert bullets
-        content = re.sub(r'^- (.+)', r'• \1', content, flags=re.MULTILINE)
+        content = _BULLET_LINE_RE.sub(r'• \1', content)
         # Replace emojis
-        content = content.replace('🔴', 'CRITICAL:')
-        content = content.replace('🟠', 'HIGH:')
-        content = content.replace('🟡', 'MEDIUM:')
-        content = content.replace('🔵', 'LOW:')
-        content = content.replace('✅', 'OK')
-        content = content.replace('❌', 'FAIL')
+        content = _SEVERITY_TEXT_BASIC_RE.sub(lambda m: _SEVERITY_TEXT_REPLACEMENTS[m.group()], content)
         # Remove remaining markdown
-        content = re.sub(r'\*\*(.*?)\*\*', r'\1', content)
-        content = re.sub(r'\*(.*?)\*', r'\1', content)
-        content = re.sub(r'`([^`]+)`', r'\1', content)
+        content = _BOLD_RE.sub(r'\1', content)
+        content = _ITALIC_RE.sub(r'\1', content)
+        content = _CODE_RE.sub(r'\1', content)
         # Clean up spacing
-        content = re.sub(r'\n{3,}', '\n\n', content)
+        content = _EXCESS_BLANK_LINES_RE.sub('\n\n', content)
         return content.strip()
     except Exception as e:
         return markdown_content
-# MANDATORY UPDATES ONLY - Add these functions to ui/components.py
-
-def _create_individual_analyses_tab(ai_result: Dict[str, Any]):
-    """
-    Create individual analyses tab with both readable format and raw AI output.
-    MINIMAL UPDATE: Only added explanation field support where essential
-    """
-    from utils.json_utils import convert_violations_json_to_readable
-    
-    st.markdown("### Individual Chunk Analysis Results")
-    
-    analysis_details = ai_result.get('analysis_results', [])
-    stats = ai_result.get('statistics', {})
-    
-    # Processing metrics (unchanged)
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        st.metric("Processing Time", f"{stats.get('total_processing_time', 0):.2f}s")
-    with col2:
-        st.metric("Total Chunks", stats.get('total_chunks', 0))
-    with col3:
-        st.metric("Successful", stats.get('successful_analyses', 0))
-    with col4:
-        st.metric("Failed", stats.get('failed_analyses', 0))
-    
-    st.markdown("---")
-    
-    # Individual results - MINIMAL CHANGE: just show explanation if available
-    for detail in analysis_details:
-        chunk_idx = detail.get('chunk_index', 'Unknown')
-        if detail.get('success'):
-            readable_content = convert_violations_json_to_readable(detail["content"])
-            
-            # MINIMAL ADDITION: Check for explanation
-            try:
-                import json
-                ai_response = json.loads(detail["content"])
-                section_explanation = ai_response.get('explanation', '')
-            except:
-                section_explanation = ''
-            
-            with st.expander(f"✅ Chunk {chunk_idx} Analysis (Success)"):
-                # MINIMAL ADDITION: Show explanation if available
-                if section_explanation and section_explanation.strip():
-                    st.info(f"**Analysis Overview:** {section_explanation}")
-                
-                # Tab structure: Readable + Raw (unchanged)
-                tab1, tab2 = st.tabs(["📖 Readable Format", "🔧 Raw AI Output"])
-                
-                with tab1:
-                    st.markdown("**Human-Readable Violations:**")
-                    st.markdown(readable_content)
-                
-                with tab2:
-                    st.markdown("**Raw AI Response (for prompt debugging):**")
-                    st.code(detail['content'], language='json')
-                    
-                    # Additional debug info (unchanged)
-                    st.markdown("**Debug Information:**")
-                    col_a, col_b = st.columns(2)
-                    with col_a:
-                        st.write(f"**Response Length:** {len(detail['content']):,} characters")
-                        st.write(f"**Processing Time:** {detail.get('processing_time', 0):.2f}s")
-                    with col_b:
-                        try:
-                            import json
-                            parsed = json.loads(detail['content'])
-                            violation_count = len(parsed.get('violations', []))
-                            st.write(f"**Violations Found:** {violation_count}")
-                            st.write(f"**Valid JSON:** ✓")
-                        except:
-                            st.write(f"**Violations Found:** Parse Error")
-                            st.write(f"**Valid JSON:** ✗")
-        else:
-            with st.expander(f"❌ Chunk {chunk_idx} Analysis (Failed)"):
-                st.error(f"Error: {detail.get('error', 'Unknown error')}")
-                if 'processing_time' in detail:
-                    st.caption(f"Processing time: {detail['processing_time']:.2f}s")
 def _create_json_tab(result: Dict[str, Any]):
     """Create JSON output tab content with proper Unicode display."""
     st.subheader("🔧 JSON Output")
@@ -1185,7 +1001,6 @@ def _create_json_tab(result: Dict[str, Any]):
         # Fallback: convert dict back to pretty JSON string
         json_output_dict = result.get('json_output')
         if json_output_dict:
-            from utils.json_utils import get_display_json_string
             display_json = get_display_json_string(json_output_dict)
             st.warning("⚠️ Using fallback conversion from dict")
         else:
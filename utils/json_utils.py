@@ -4,15 +4,56 @@ JSON processing utilities for YMYL Audit Tool
 UPDATED: Single request architecture - process AI JSON array response
 """
 
+import io
 import json
 import hashlib
+import logging
 import re
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple, Union
 from utils.logging_utils import setup_logger
 
+# Optional fast JSON backends - fall back to the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
 logger = setup_logger(__name__)
 
+# Precompiled once at import instead of per call / per violation
+_UNICODE_ESCAPE_RE = re.compile(r'\\u([0-9a-fA-F]{4})')
+
+_SEVERITY_EMOJI = {
+    "critical": "🔴",
+    "high": "🟠",
+    "medium": "🟡",
+    "low": "🔵"
+}
+
+# Static report scaffolding, filled in with str.format instead of rebuilt as f-strings per report
+_REPORT_HEADER_TEMPLATE = """# YMYL Compliance Audit Report
+
+**Date:** {date}
+**Analysis Type:** Single Request Analysis
+
+---
+
+"""
+_REPORT_SUMMARY_TEMPLATE = """## 📈 Analysis Summary
+
+**Sections with Violations:** {sections_with_violations}
+**Total Violations:** {total_violations}
+**Analysis Method:** Single Request Processing
+
+"""
+_NO_VIOLATIONS_SECTION_TEMPLATE = "## {content_name}\n\n✅ **No violations found in this section.**\n\n"
+
 
 def decode_unicode_escapes(text: str) -> str:
     """Decode Unicode escape sequences safely."""
@@ -23,22 +64,25 @@ def decode_unicode_escapes(text: str) -> str:
                 code_point = int(unicode_code, 16)
                 
                 if 0xD800 <= code_point <= 0xDFFF:
-                    logger.warning(f"Replacing surrogate Unicode \\u{unicode_code} with replacement character")
+                    # Called once per escape, so the message is formatted lazily
+                    logger.warning("Replacing surrogate Unicode \\u%s with replacement character", unicode_code)
                     return '\uFFFD'
                 
                 return chr(code_point)
                 
             except (ValueError, OverflowError) as e:
-                logger.warning(f"Invalid Unicode escape \\u{match.group(1)}: {e}")
+                logger.warning("Invalid Unicode escape \\u%s: %s", match.group(1), e)
                 return '\uFFFD'
         
-        decoded = re.sub(r'\\u([0-9a-fA-F]{4})', safe_decode_match, text)
+        decoded = _UNICODE_ESCAPE_RE.sub(safe_decode_match, text)
         decoded = clean_surrogate_pairs(decoded)
         
-        if decoded != text:
+        # The counts cost two extra scans, so only take them when debug output is on
+        if logger.isEnabledFor(logging.DEBUG) and decoded != text:
             original_unicode_count = text.count('\\u')
             remaining_unicode_count = decoded.count('\\u')
-            logger.debug(f"Unicode decoding: {original_unicode_count} sequences found, {remaining_unicode_count} remaining")
+            logger.debug("Unicode decoding: %d sequences found, %d remaining",
+                         original_unicode_count, remaining_unicode_count)
         
         return decoded
         
@@ -50,20 +94,19 @@ def decode_unicode_escapes(text: str) -> str:
 def clean_surrogate_pairs(text: str) -> str:
     """Clean surrogate pairs from text."""
     try:
-        cleaned = text.encode('utf-8', errors='replace').decode('utf-8')
-        
-        def replace_problematic_char(char):
-            try:
-                char.encode('utf-8')
-                return char
-            except UnicodeEncodeError:
-                return '\uFFFD'
+        # Fast path: the UTF-8 codec validates in C, and clean text is returned unchanged
+        try:
+            text.encode('utf-8')
+            return text
+        except UnicodeEncodeError:
+            pass
         
-        final_cleaned = ''.join(replace_problematic_char(char) for char in cleaned)
+        # The codec's 'replace' handler swaps each unencodable character for '?'
+        # in one native pass - no per-character Python work needed afterwards
+        final_cleaned = text.encode('utf-8', errors='replace').decode('utf-8')
         
-        if final_cleaned != text:
-            problem_chars = len(text) - len([c for c in text if c == replace_problematic_char(c)])
-            logger.info(f"Cleaned {problem_chars} problematic Unicode characters")
+        problem_chars = final_cleaned.count('?') - text.count('?')
+        logger.info(f"Cleaned {problem_chars} problematic Unicode characters")
         
         return final_cleaned
         
@@ -72,8 +115,35 @@ def clean_surrogate_pairs(text: str) -> str:
         return text.encode('ascii', errors='replace').decode('ascii')
 
 
+def _reject_for_stdlib(obj: Any) -> Any:
+    """orjson default hook: leave types it doesn't natively handle to the stdlib path."""
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
 def safe_json_dumps(data: Any, **kwargs) -> str:
     """Safely serialize data to JSON."""
+    # orjson fast path for the default indent=2 call. Its output matches the stdlib
+    # path for plain JSON data except that floats in or near exponent range may be
+    # spelled differently (same value; the exact forms vary by orjson version, e.g.
+    # 1e16 / 1.5e-7 / 0.00001 where json.dumps writes 1e+16 / 1.5e-07 / 1e-05), and
+    # UUID/Enum values are serialized where json.dumps raises TypeError.
+    # Everything else goes through the stdlib path: datetime, dataclass and
+    # str/int/dict/list subclass values (passed through to _reject_for_stdlib), anything
+    # orjson rejects (lone surrogates, non-str keys, huge ints), and any output containing
+    # null, since orjson also writes NaN/Infinity as null.
+    if orjson is not None and set(kwargs) <= {'indent'} and kwargs.get('indent', 2) == 2:
+        try:
+            dumped = orjson.dumps(
+                data,
+                default=_reject_for_stdlib,
+                option=(orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME
+                        | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_SUBCLASS)
+            )
+            if b'null' not in dumped:
+                return dumped.decode('utf-8')
+        except orjson.JSONEncodeError:
+            pass
+    
     try:
         safe_kwargs = {
             'ensure_ascii': False,
@@ -82,11 +152,9 @@ def safe_json_dumps(data: Any, **kwargs) -> str:
         }
         safe_kwargs.update(kwargs)
         
+        # json.dumps output is valid JSON by construction; no need to parse it back
         json_str = json.dumps(data, **safe_kwargs)
-        cleaned_json = clean_surrogate_pairs(json_str)
-        json.loads(cleaned_json)  # Validate
-        
-        return cleaned_json
+        return clean_surrogate_pairs(json_str)
         
     except (UnicodeEncodeError, json.JSONDecodeError) as e:
         logger.warning(f"JSON serialization had Unicode issues, using ASCII-safe mode: {e}")
@@ -99,11 +167,33 @@ def safe_json_dumps(data: Any, **kwargs) -> str:
             return '{"error": "JSON serialization failed due to Unicode issues"}'
 
 
+def fast_json_loads(json_str: Union[str, bytes]) -> Any:
+    """Parse JSON with orjson when available, keeping stdlib semantics on rejection."""
+    if orjson is not None:
+        try:
+            return orjson.loads(json_str)
+        except orjson.JSONDecodeError:
+            # orjson is stricter (e.g. NaN/Infinity); let stdlib decide
+            pass
+    return json.loads(json_str)
+
+
+def fast_json_dumps(data: Any) -> str:
+    """Serialize compact JSON with orjson when available (returns str, not bytes)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data).decode('utf-8')
+        except (orjson.JSONEncodeError, UnicodeDecodeError):
+            # e.g. lone surrogates or non-str keys; let stdlib decide
+            pass
+    return json.dumps(data)
+
+
 def safe_json_loads(json_str: str) -> Any:
     """Safely parse JSON string."""
     try:
         cleaned_json = clean_surrogate_pairs(json_str)
-        return json.loads(cleaned_json)
+        return fast_json_loads(cleaned_json)
         
     except json.JSONDecodeError as e:
         logger.error(f"JSON parsing failed even after cleaning: {e}")
@@ -113,6 +203,37 @@ def safe_json_loads(json_str: str) -> Any:
         return None
 
 
+def validate_json_syntax(json_str: str) -> Tuple[bool, Optional[str]]:
+    """
+    Check that a string is well-formed JSON without keeping the parsed result.
+    
+    Uses pysimdjson's lazy document when available so no Python dict/list tree
+    is materialized for a validate-only pass.
+    
+    Args:
+        json_str (str): JSON text to check
+        
+    Returns:
+        tuple: (is_valid: bool, error: str or None)
+    """
+    if simdjson is not None:
+        try:
+            simdjson.Parser().parse(json_str.encode('utf-8'))
+            return True, None
+        except (ValueError, UnicodeEncodeError, RuntimeError):
+            # RuntimeError covers simdjson's DEPTH_ERROR/CAPACITY limits; let the
+            # regular parser decide (and produce the error message)
+            pass
+    
+    try:
+        fast_json_loads(json_str)
+        return True, None
+    except (ValueError, UnicodeEncodeError) as e:
+        return False, str(e)
+    except RecursionError:
+        return False, "JSON is nested too deeply to parse"
+
+
 def parse_json_output(json_string: str) -> Optional[Dict[str, Any]]:
     """Parse JSON string with validation."""
     try:
@@ -140,6 +261,42 @@ def parse_json_output(json_string: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+def _write_violation_markdown(buf: io.StringIO, index: int, violation: Dict[str, Any]) -> None:
+    """Write one violation as a markdown block (shared by both report converters)."""
+    write = buf.write
+    severity = violation.get('severity', 'medium')
+    severity_emoji = _SEVERITY_EMOJI.get(severity, "🟡")
+    
+    # Clean all text fields
+    violation_type = clean_surrogate_pairs(str(violation.get('violation_type', 'Unknown violation')))
+    problematic_text = clean_surrogate_pairs(str(violation.get('problematic_text', 'N/A')))
+    explanation = clean_surrogate_pairs(str(violation.get('explanation', 'No explanation provided')))
+    suggested_rewrite = clean_surrogate_pairs(str(violation.get('suggested_rewrite', 'No suggestion provided')))
+    
+    # Handle translation fields
+    translation = violation.get('translation', '')
+    rewrite_translation = violation.get('rewrite_translation', '')
+    
+    write(f"**{severity_emoji} Violation {index}**\n"
+          f"- **Issue:** {violation_type}\n"
+          f"- **Problematic Text:** \"{problematic_text}\"\n")
+    
+    # Add translation if present
+    if translation:
+        write(f"- **Translation:** \"{clean_surrogate_pairs(str(translation))}\"\n")
+    
+    write(f"- **Explanation:** {explanation}\n"
+          f"- **Guideline Reference:** Section {violation.get('guideline_section', 'N/A')} (Page {violation.get('page_number', 'N/A')})\n"
+          f"- **Severity:** {severity.title()}\n"
+          f"- **Suggested Fix:** \"{suggested_rewrite}\"\n")
+    
+    # Add rewrite translation if present
+    if rewrite_translation:
+        write(f"- **Translation of Fix:** \"{clean_surrogate_pairs(str(rewrite_translation))}\"\n")
+    
+    write("\n")
+
+
 def convert_ai_response_to_markdown(ai_response: List[Dict[str, Any]]) -> str:
     """
     Convert AI JSON array response to markdown report.
@@ -150,23 +307,20 @@ def convert_ai_response_to_markdown(ai_response: List[Dict[str, Any]]) -> str:
             logger.error("AI response is not a list")
             return "❌ **Error**: Invalid AI response format"
         
-        report_parts = []
+        # Single buffer for the whole report - no per-violation intermediate strings
+        report = io.StringIO()
+        write = report.write
         
         # Add report header
-        report_parts.append(f"""# YMYL Compliance Audit Report
-
-**Date:** {datetime.now().strftime("%Y-%m-%d")}
-**Analysis Type:** Single Request Analysis
-
----
-
-""")
+        write(_REPORT_HEADER_TEMPLATE.format(date=datetime.now().strftime("%Y-%m-%d")))
         
         # Process each chunk response
         sections_with_violations = 0
         total_violations = 0
         
         for chunk_response in ai_response:
+            # Position after the last fully written violation, to roll back partial output on error
+            rollback_position = report.tell()
             try:
                 chunk_index = chunk_response.get('big_chunk_index', 'Unknown')
                 content_name = chunk_response.get('content_name', f'Section {chunk_index}')
@@ -174,79 +328,38 @@ def convert_ai_response_to_markdown(ai_response: List[Dict[str, Any]]) -> str:
                 
                 # Handle "no violation found" case
                 if violations == "no violation found" or not violations:
-                    report_parts.append(f"## {content_name}\n\n✅ **No violations found in this section.**\n\n")
+                    write(_NO_VIOLATIONS_SECTION_TEMPLATE.format(content_name=content_name))
                     continue
                 
                 # Add section header
-                report_parts.append(f"## {content_name}\n\n")
+                write(f"## {content_name}\n\n")
                 sections_with_violations += 1
                 
                 # Process violations
                 for i, violation in enumerate(violations, 1):
+                    rollback_position = report.tell()
                     total_violations += 1
-                    
-                    severity_emoji = {
-                        "critical": "🔴",
-                        "high": "🟠",
-                        "medium": "🟡", 
-                        "low": "🔵"
-                    }.get(violation.get("severity", "medium"), "🟡")
-                    
-                    # Clean all text fields
-                    violation_type = clean_surrogate_pairs(str(violation.get('violation_type', 'Unknown violation')))
-                    problematic_text = clean_surrogate_pairs(str(violation.get('problematic_text', 'N/A')))
-                    explanation = clean_surrogate_pairs(str(violation.get('explanation', 'No explanation provided')))
-                    suggested_rewrite = clean_surrogate_pairs(str(violation.get('suggested_rewrite', 'No suggestion provided')))
-                    
-                    # Handle translation fields
-                    translation = violation.get('translation', '')
-                    rewrite_translation = violation.get('rewrite_translation', '')
-                    
-                    violation_text = f"""**{severity_emoji} Violation {i}**
-- **Issue:** {violation_type}
-- **Problematic Text:** "{problematic_text}"
-"""
-                    
-                    # Add translation if present
-                    if translation:
-                        clean_translation = clean_surrogate_pairs(str(translation))
-                        violation_text += f"- **Translation:** \"{clean_translation}\"\n"
-                    
-                    violation_text += f"""- **Explanation:** {explanation}
-- **Guideline Reference:** Section {violation.get('guideline_section', 'N/A')} (Page {violation.get('page_number', 'N/A')})
-- **Severity:** {violation.get('severity', 'medium').title()}
-- **Suggested Fix:** "{suggested_rewrite}"
-"""
-                    
-                    # Add rewrite translation if present
-                    if rewrite_translation:
-                        clean_rewrite_translation = clean_surrogate_pairs(str(rewrite_translation))
-                        violation_text += f"- **Translation of Fix:** \"{clean_rewrite_translation}\"\n"
-                    
-                    violation_text += "\n"
-                    report_parts.append(violation_text)
+                    _write_violation_markdown(report, i, violation)
                 
-                report_parts.append("\n")
+                write("\n")
                 
             except Exception as e:
+                report.seek(rollback_position)
+                report.truncate()
                 logger.error(f"Error processing chunk {chunk_response.get('big_chunk_index', 'Unknown')}: {e}")
                 continue
         
         # Add summary if no violations found
         if sections_with_violations == 0:
-            report_parts.append("✅ **No violations found across all content sections.**\n\n")
+            write("✅ **No violations found across all content sections.**\n\n")
         
         # Add processing summary
-        report_parts.append(f"""## 📈 Analysis Summary
-
-**Sections with Violations:** {sections_with_violations}
-**Total Violations:** {total_violations}
-**Analysis Method:** Single Request Processing
-
-""")
+        write(_REPORT_SUMMARY_TEMPLATE.format(
+            sections_with_violations=sections_with_violations,
+            total_violations=total_violations
+        ))
         
-        final_report = ''.join(report_parts)
-        return clean_surrogate_pairs(final_report)
+        return clean_surrogate_pairs(report.getvalue())
         
     except Exception as e:
         logger.error(f"Error converting AI response to markdown: {e}")
@@ -277,51 +390,11 @@ def convert_violations_json_to_readable(json_content: str) -> str:
         if not violations or violations == "no violation found":
             return "✅ **No violations found in this section.**\n\n"
         
-        readable_parts = []
-        
+        readable = io.StringIO()
         for i, violation in enumerate(violations, 1):
-            severity_emoji = {
-                "critical": "🔴",
-                "high": "🟠",
-                "medium": "🟡", 
-                "low": "🔵"
-            }.get(violation.get("severity", "medium"), "🟡")
-            
-            # Clean all text fields
-            violation_type = clean_surrogate_pairs(str(violation.get('violation_type', 'Unknown violation')))
-            problematic_text = clean_surrogate_pairs(str(violation.get('problematic_text', 'N/A')))
-            explanation = clean_surrogate_pairs(str(violation.get('explanation', 'No explanation provided')))
-            suggested_rewrite = clean_surrogate_pairs(str(violation.get('suggested_rewrite', 'No suggestion provided')))
-            
-            # Handle translation fields
-            translation = violation.get('translation', '')
-            rewrite_translation = violation.get('rewrite_translation', '')
-            
-            violation_text = f"""**{severity_emoji} Violation {i}**
-- **Issue:** {violation_type}
-- **Problematic Text:** "{problematic_text}"
-"""
-            
-            # Add translation if present
-            if translation:
-                clean_translation = clean_surrogate_pairs(str(translation))
-                violation_text += f"- **Translation:** \"{clean_translation}\"\n"
-            
-            violation_text += f"""- **Explanation:** {explanation}
-- **Guideline Reference:** Section {violation.get('guideline_section', 'N/A')} (Page {violation.get('page_number', 'N/A')})
-- **Severity:** {violation.get('severity', 'medium').title()}
-- **Suggested Fix:** "{suggested_rewrite}"
-"""
-            
-            # Add rewrite translation if present
-            if rewrite_translation:
-                clean_rewrite_translation = clean_surrogate_pairs(str(rewrite_translation))
-                violation_text += f"- **Translation of Fix:** \"{clean_rewrite_translation}\"\n"
-            
-            violation_text += "\n"
-            readable_parts.append(violation_text)
+            _write_violation_markdown(readable, i, violation)
         
-        return ''.join(readable_parts)
+        return readable.getvalue()
         
     except Exception as e:
         logger.error(f"Error converting JSON to readable format: {e}")
@@ -352,6 +425,31 @@ def get_display_json_string(json_data: Union[Dict[str, Any], str]) -> str:
         return clean_surrogate_pairs(str(json_data))
 
 
+def _has_min_content(small_chunks: List[Any], min_length: int) -> bool:
+    """
+    Check that '\n'.join(small_chunks).strip() is at least min_length characters
+    without building the joined string - usually the first small chunk decides.
+    Surrogate cleaning replaces characters one-for-one with '?', so it can't change the result.
+    """
+    length = 0    # characters from the first non-whitespace one to the last one seen
+    trailing = 0  # whitespace since then, counted only once more content follows
+    for i, small_chunk in enumerate(small_chunks):
+        piece = str(small_chunk)
+        if i:
+            piece = '\n' + piece
+        if not length:
+            piece = piece.lstrip()
+        content = piece.rstrip()
+        if content:
+            length += trailing + len(content)
+            trailing = len(piece) - len(content)
+            if length >= min_length:
+                return True
+        else:
+            trailing += len(piece)
+    return False
+
+
 def validate_chunk_structure(json_data: Dict[str, Any]) -> bool:
     """Validate JSON chunk structure."""
     try:
@@ -387,10 +485,7 @@ def validate_chunk_structure(json_data: Dict[str, Any]) -> bool:
                 logger.warning(f"Chunk {i} has empty 'small_chunks'")
                 continue
             
-            total_content = '\n'.join(str(sc) for sc in small_chunks)
-            cleaned_content = clean_surrogate_pairs(total_content)
-            
-            if len(cleaned_content.strip()) < 10:
+            if not _has_min_content(small_chunks, 10):
                 logger.warning(f"Chunk {i} has insufficient content after Unicode cleaning")
                 continue
             
@@ -413,11 +508,11 @@ def _generate_content_hash(content: str) -> str:
     """Generate hash for content comparison."""
     try:
         cleaned_content = clean_surrogate_pairs(content)
-        return hashlib.sha256(cleaned_content.encode('utf-8')).hexdigest()[:16]
+        return hashlib.blake2b(cleaned_content.encode('utf-8'), digest_size=8).hexdigest()
     except Exception as e:
         logger.warning(f"Error generating content hash: {e}")
         ascii_content = content.encode('ascii', errors='replace').decode('ascii')
-        return hashlib.sha256(ascii_content.encode('ascii')).hexdigest()[:16]
+        return hashlib.blake2b(ascii_content.encode('ascii'), digest_size=8).hexdigest()
 
 
 def _create_display_version(json_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -455,6 +550,9 @@ __all__ = [
     'clean_surrogate_pairs',
     'safe_json_dumps',
     'safe_json_loads',
+    'fast_json_loads',
+    'fast_json_dumps',
+    'validate_json_syntax',
     'parse_json_output',
     'convert_ai_response_to_markdown',
     'convert_violations_json_to_readable',  # ADDED
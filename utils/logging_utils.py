@@ -8,8 +8,11 @@ FIXED: Improved import structure and error handling
 """
 
 import logging
+import re
+import time
 from datetime import datetime
-from typing import Dict, Any, Union
+from functools import lru_cache
+from typing import Dict, Any, Tuple, Union
 import pytz
 
 # Import settings with error handling
@@ -54,6 +57,28 @@ def setup_logger(name: str, level: Union[str, int] = None) -> logging.Logger:
     return logger
 
 
+@lru_cache(maxsize=8)
+def _get_timezone(timezone: str):
+    """Resolve a timezone name once; every UI log line asks for the same zone."""
+    return pytz.timezone(timezone)
+
+
+# Last formatted UI timestamp per timezone, as (epoch second, 'HH:MM:SS')
+_timestamp_cache: Dict[str, Tuple[int, str]] = {}
+
+
+def _format_current_time(timezone: str) -> str:
+    """Format the current time as HH:MM:SS, reusing the string for log lines in the same second."""
+    now = time.time()
+    second = int(now)
+    cached = _timestamp_cache.get(timezone)
+    if cached is not None and cached[0] == second:
+        return cached[1]
+    timestamp = datetime.fromtimestamp(now, _get_timezone(timezone)).strftime('%H:%M:%S')
+    _timestamp_cache[timezone] = (second, timestamp)
+    return timestamp
+
+
 def log_with_timestamp(message: str, timezone: str = DEFAULT_TIMEZONE) -> str:
     """
     Add timestamp to log message for UI display.
@@ -66,8 +91,7 @@ def log_with_timestamp(message: str, timezone: str = DEFAULT_TIMEZONE) -> str:
         str: Formatted message with timestamp
     """
     try:
-        tz = pytz.timezone(timezone)
-        timestamp = datetime.now(tz).strftime('%H:%M:%S')
+        timestamp = _format_current_time(timezone)
         return f"`{timestamp}`: {message}"
     except Exception as e:
         # Fallback to simple timestamp if timezone fails
@@ -178,6 +202,37 @@ def create_simple_progress_message(step_name: str, current: int = None, total: i
     else:
         return simple_name
 
+# Error categories in priority order: (category, trigger substrings, user message, suggestion)
+_ERROR_CATEGORIES = [
+    ('timeout', ('timeout', 'timed out', 'time out'),
+     'The website took too long to respond',
+     'Try again, or check if the website is working in your browser'),
+    ('connection', ('connection', 'network', 'dns', 'resolve'),
+     'Could not connect to the website',
+     'Check your internet connection and verify the URL is correct'),
+    ('format', ('json', 'parse', 'format', 'invalid'),
+     'There is an issue with the data format',
+     'Check that your JSON follows the correct format'),
+    ('api', ('api', 'key', 'authentication', 'unauthorized'),
+     'Issue with AI analysis service access',
+     'Check your API key or try again in a moment'),
+    ('size', ('memory', 'large', 'size', 'limit'),
+     'The content is too large to process',
+     'Try with a smaller webpage or reduce your JSON content'),
+]
+
+# All trigger substrings in one case-insensitive scan. The lookahead tests every
+# position without consuming text, so overlapping terms are all reported, and the
+# named group tells which category matched.
+_ERROR_CATEGORY_RE = re.compile(
+    '(?=' + '|'.join(
+        f"(?P<{category}>{'|'.join(map(re.escape, terms))})"
+        for category, terms, _, _ in _ERROR_CATEGORIES
+    ) + ')',
+    re.IGNORECASE
+)
+
+
 def categorize_error_for_user(error_message: str, error_type: str = "") -> dict:
     """
     Categorize errors and provide user-friendly information.
@@ -196,43 +251,16 @@ def categorize_error_for_user(error_message: str, error_type: str = "") -> dict:
         'technical_details': error_message
     }
     
-    # Analyze the error message to categorize it
-    error_lower = error_message.lower()
-    
-    if any(term in error_lower for term in ['timeout', 'timed out', 'time out']):
-        error_info.update({
-            'category': 'timeout',
-            'user_message': 'The website took too long to respond',
-            'suggestion': 'Try again, or check if the website is working in your browser'
-        })
-    
-    elif any(term in error_lower for term in ['connection', 'network', 'dns', 'resolve']):
-        error_info.update({
-            'category': 'connection',
-            'user_message': 'Could not connect to the website',
-            'suggestion': 'Check your internet connection and verify the URL is correct'
-        })
-    
-    elif any(term in error_lower for term in ['json', 'parse', 'format', 'invalid']):
-        error_info.update({
-            'category': 'format',
-            'user_message': 'There is an issue with the data format',
-            'suggestion': 'Check that your JSON follows the correct format'
-        })
-    
-    elif any(term in error_lower for term in ['api', 'key', 'authentication', 'unauthorized']):
-        error_info.update({
-            'category': 'api',
-            'user_message': 'Issue with AI analysis service access',
-            'suggestion': 'Check your API key or try again in a moment'
-        })
-    
-    elif any(term in error_lower for term in ['memory', 'large', 'size', 'limit']):
-        error_info.update({
-            'category': 'size',
-            'user_message': 'The content is too large to process',
-            'suggestion': 'Try with a smaller webpage or reduce your JSON content'
-        })
+    # Analyze the error message to categorize it - first category in priority order wins
+    matched = {match.lastgroup for match in _ERROR_CATEGORY_RE.finditer(error_message)}
+    for category, _, user_message, suggestion in _ERROR_CATEGORIES:
+        if category in matched:
+            error_info.update({
+                'category': category,
+                'user_message': user_message,
+                'suggestion': suggestion
+            })
+            break
     
     return error_info        
 
@@ -391,7 +419,7 @@ def get_logger(name: str) -> logging.Logger:
 def format_timestamp(timezone: str = DEFAULT_TIMEZONE) -> str:
     """Get current timestamp formatted for the given timezone."""
     try:
-        tz = pytz.timezone(timezone)
+        tz = _get_timezone(timezone)
         return datetime.now(tz).strftime('%Y-%m-%d %H:%M:%S %Z')
     except Exception:
         return datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')